@@ -6,34 +6,91 @@ import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.const import Platform
+from homeassistant.exceptions import ConfigEntryNotReady
 
-from .base import LaresBase
 from .coordinator import LaresDataUpdateCoordinator
-from .const import DOMAIN, DATA_COORDINATOR, DATA_UPDATE_LISTENER
+from .manager import LaresManager
+from .services import async_setup_services
+from .store import LaresDescriptionStore
+from .const import (
+    DOMAIN,
+    DATA_COORDINATOR,
+    DATA_DESCRIPTIONS,
+    DATA_DEVICE_INFO,
+    DATA_PARTITIONS,
+    DATA_UPDATE_LISTENER,
+    DATA_ZONES,
+)
 
 CONFIG_SCHEMA = vol.Schema({DOMAIN: vol.Schema({})}, extra=vol.ALLOW_EXTRA)
 PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR, Platform.ALARM_CONTROL_PANEL, Platform.SWITCH]
 
 
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Set up the Ksenia Lares services."""
+    await async_setup_services(hass)
+
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up Ksenia Lares Alarm from a config entry."""
 
-    client = LaresBase(entry.data)
-    coordinator = LaresDataUpdateCoordinator(hass, client)
+    # Panels share a connection pool and request limit, and poll each
+    # document on the tick of their own slot
+    manager = LaresManager.async_get(hass)
+    client = manager.create_client(entry.entry_id, entry.data)
+    store = LaresDescriptionStore(hass, entry.entry_id, client)
+    coordinator = LaresDataUpdateCoordinator(
+        hass, client, entry.options, store, manager.slot(entry.entry_id)
+    )
 
     # Preload device info
-    await client.device_info()
+    device_info = await client.device_info()
+
+    if device_info is None:
+        await manager.async_release(entry.entry_id)
+        raise ConfigEntryNotReady(f"Unable to connect to {entry.data['host']}")
+
+    # Store the MAC address so the ARP lookup is not repeated on restart
+    info = await client.info()
+
+    if info["mac"] is not None and "mac" not in entry.data:
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, "mac": info["mac"]}
+        )
+
+    # Use descriptions from disk, the coordinator revalidates them afterwards
+    descriptions = await store.async_load()
+
+    if descriptions is not None:
+        client.preload_descriptions(descriptions)
+
+    # Single refresh shared by all platforms, including the descriptions
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except ConfigEntryNotReady:
+        await manager.async_release(entry.entry_id)
+        raise
+
+    # Platforms need every resource to create their entities
+    if any(
+        coordinator.data[key] is None
+        for key in (DATA_ZONES, DATA_PARTITIONS, DATA_DESCRIPTIONS)
+    ):
+        await manager.async_release(entry.entry_id)
+        raise ConfigEntryNotReady("Unable to fetch initial data")
 
     unsub_options_update_listener = entry.add_update_listener(options_update_listener)
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         DATA_COORDINATOR: coordinator,
+        DATA_DEVICE_INFO: device_info,
+        DATA_DESCRIPTIONS: coordinator.data[DATA_DESCRIPTIONS],
         DATA_UPDATE_LISTENER: unsub_options_update_listener,
     }
 
-    hass.async_create_task(
-        hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    )
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
@@ -55,12 +112,19 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     )
 
     if unload_ok:
-        hass.data[DOMAIN][entry.entry_id][DATA_UPDATE_LISTENER]()
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        data[DATA_UPDATE_LISTENER]()
+        await data[DATA_COORDINATOR].async_shutdown()
+        await LaresManager.async_get(hass).async_release(entry.entry_id)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored descriptions of a config entry."""
+    await LaresDescriptionStore.async_remove(hass, entry.entry_id)
+
+
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     """Migrate old entry."""
 
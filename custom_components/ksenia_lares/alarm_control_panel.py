@@ -1,6 +1,5 @@
 """Component to interface with a Lares Ksenia alarm control panel."""
 
-from datetime import timedelta
 import logging
 
 from homeassistant.components.alarm_control_panel import (
@@ -9,6 +8,8 @@ from homeassistant.components.alarm_control_panel import (
     AlarmControlPanelState,
     CodeFormat,
 )
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -21,8 +22,12 @@ from .const import (
     CONF_SCENARIO_HOME,
     CONF_SCENARIO_NIGHT,
     DATA_COORDINATOR,
+    DATA_DESCRIPTIONS,
+    DATA_DEVICE_INFO,
     DATA_PARTITIONS,
+    DATA_SCENARIOS,
     DOMAIN,
+    OPTIMISTIC_TIMEOUT,
     PARTITION_STATUS_ARMED,
     PARTITION_STATUS_ARMED_IMMEDIATE,
     PARTITION_STATUS_ARMING,
@@ -30,16 +35,16 @@ from .const import (
 from .coordinator import LaresDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
-SCAN_INTERVAL = timedelta(seconds=10)
 
 
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Set up alarm control panel of the Lares alarm device from a config entry."""
 
-    coordinator = hass.data[DOMAIN][config_entry.entry_id][DATA_COORDINATOR]
-    device_info = await coordinator.client.device_info()
-    partition_descriptions = await coordinator.client.partition_descriptions()
-    scenario_descriptions = await coordinator.client.scenario_descriptions()
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = entry_data[DATA_COORDINATOR]
+    device_info = entry_data[DATA_DEVICE_INFO]
+    partition_descriptions = entry_data[DATA_DESCRIPTIONS][DATA_PARTITIONS]
+    scenario_descriptions = entry_data[DATA_DESCRIPTIONS][DATA_SCENARIOS]
 
     options = {
         CONF_PARTITION_AWAY: config_entry.options.get(CONF_PARTITION_AWAY, []),
@@ -51,9 +56,6 @@ async def async_setup_entry(hass, config_entry, async_add_devices):
         CONF_SCENARIO_DISARM: config_entry.options.get(CONF_SCENARIO_DISARM, []),
     }
 
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_refresh()
-
     async_add_devices(
         [
             LaresAlarmControlPanel(
@@ -72,6 +74,17 @@ class LaresAlarmControlPanel(CoordinatorEntity, AlarmControlPanelEntity):
 
     TYPE = DOMAIN
     ARMED_STATUS = [PARTITION_STATUS_ARMED, PARTITION_STATUS_ARMED_IMMEDIATE]
+    COMMAND_STATES = {
+        CONF_SCENARIO_AWAY: AlarmControlPanelState.ARMED_AWAY,
+        CONF_SCENARIO_HOME: AlarmControlPanelState.ARMED_HOME,
+        CONF_SCENARIO_NIGHT: AlarmControlPanelState.ARMED_NIGHT,
+        CONF_SCENARIO_DISARM: AlarmControlPanelState.DISARMED,
+    }
+    PARTITION_STATES = {
+        CONF_PARTITION_AWAY: AlarmControlPanelState.ARMED_AWAY,
+        CONF_PARTITION_HOME: AlarmControlPanelState.ARMED_HOME,
+        CONF_PARTITION_NIGHT: AlarmControlPanelState.ARMED_NIGHT,
+    }
 
     def __init__(
         self,
@@ -82,7 +95,7 @@ class LaresAlarmControlPanel(CoordinatorEntity, AlarmControlPanelEntity):
         options: dict,
     ) -> None:
         """Initialize a the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=DATA_PARTITIONS)
 
         self._coordinator = coordinator
         self._partition_descriptions = partition_descriptions
@@ -92,6 +105,19 @@ class LaresAlarmControlPanel(CoordinatorEntity, AlarmControlPanelEntity):
         self._attr_device_info = device_info
         self._attr_code_arm_required = True
 
+        # Optimistic state after a command, until the panel reports a change
+        self._optimistic_state: StateType = None
+        self._optimistic_from: StateType = None
+        self._optimistic_since = 0.0
+        self._unsub_rollback: CALLBACK_TYPE | None = None
+
+        # Options change reloads the entry, so the indexes are built only once
+        self._partition_indexes: dict[str, list[int] | None] = {}
+        self._scenario_indexes: dict[str, list[int]] = {}
+        self.__build_indexes()
+
+        self._reported_state = self.__compute_state()
+
     @property
     def unique_id(self) -> str:
         """Return the unique ID for this entity."""
@@ -123,20 +149,86 @@ class LaresAlarmControlPanel(CoordinatorEntity, AlarmControlPanelEntity):
     @property
     def state(self) -> StateType:
         """Return the state of this panel."""
-        if self.__has_partition_with_status(PARTITION_STATUS_ARMING):
+        if self._optimistic_state is not None:
+            return self._optimistic_state
+
+        return self._reported_state
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Derive the state and confirm the optimistic state once it changes."""
+        self._reported_state = reported = self.__compute_state()
+
+        if self._optimistic_state is not None:
+            if reported != self._optimistic_from:
+                elapsed = self.hass.loop.time() - self._optimistic_since
+                _LOGGER.debug("Panel reported %s after %.2fs", reported, elapsed)
+                self.__clear_optimistic()
+
+        super()._handle_coordinator_update()
+
+    @callback
+    def __rollback(self, _now) -> None:
+        """Roll back the optimistic state, the panel did not confirm it."""
+        _LOGGER.warning("Panel did not confirm %s, rolling back", self._optimistic_state)
+        self._unsub_rollback = None
+        self.__clear_optimistic()
+        self.async_write_ha_state()
+
+    @callback
+    def __clear_optimistic(self) -> None:
+        """Clear the optimistic state and its rollback timer."""
+        self._optimistic_state = None
+
+        if self._unsub_rollback is not None:
+            self._unsub_rollback()
+            self._unsub_rollback = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending rollback."""
+        self.__clear_optimistic()
+        await super().async_will_remove_from_hass()
+
+    def __build_indexes(self) -> None:
+        """Map the configured partitions and scenarios to their index."""
+        for key in self.PARTITION_STATES:
+            partition_names = self._options[key]
+
+            # Skip the check if no partitions are linked
+            if len(partition_names) == 0:
+                self._partition_indexes[key] = None
+                continue
+
+            self._partition_indexes[key] = [
+                idx
+                for idx, name in enumerate(self._partition_descriptions)
+                if name in partition_names
+            ]
+
+        for key in self.COMMAND_STATES:
+            self._scenario_indexes[key] = [
+                idx
+                for idx, name in enumerate(self._scenario_descriptions)
+                if name == self._options[key]
+            ]
+
+    def __compute_state(self) -> StateType:
+        """Return the state of this panel, derived in one pass over the partitions."""
+        statuses = self._coordinator.data[DATA_PARTITIONS].statuses()
+
+        if PARTITION_STATUS_ARMING in statuses:
             return AlarmControlPanelState.ARMING
 
-        if self.__is_armed(CONF_PARTITION_AWAY):
-            return AlarmControlPanelState.ARMED_AWAY
+        armed = [status in self.ARMED_STATUS for status in statuses]
 
-        if self.__is_armed(CONF_PARTITION_HOME):
-            return AlarmControlPanelState.ARMED_HOME
+        for key, state in self.PARTITION_STATES.items():
+            indexes = self._partition_indexes[key]
 
-        if self.__is_armed(CONF_PARTITION_NIGHT):
-            return AlarmControlPanelState.ARMED_NIGHT
+            if indexes is not None and all(armed[idx] for idx in indexes):
+                return state
 
         # If any of the not mapped partitions is armed, show custom as fallback
-        if self.__has_partition_with_status(self.ARMED_STATUS):
+        if any(armed):
             return AlarmControlPanelState.ARMED_CUSTOM_BYPASS
 
         return AlarmControlPanelState.DISARMED
@@ -157,40 +249,6 @@ class LaresAlarmControlPanel(CoordinatorEntity, AlarmControlPanelEntity):
         """Send disarm command."""
         await self.__command(CONF_SCENARIO_DISARM, code)
 
-    def __has_partition_with_status(self, status_list: list[str]) -> bool:
-        """Return if any partitions is arming."""
-        partitions = enumerate(self._coordinator.data[DATA_PARTITIONS])
-        in_state = [
-            idx for idx, partition in partitions if partition["status"] in status_list
-        ]
-
-        _LOGGER.debug("%s in status %s", in_state, status_list)
-
-        return len(in_state) > 0
-
-    def __is_armed(self, key: str) -> bool:
-        """Return if all partitions linked to the configuration key are armed."""
-        partition_names = self._options[key]
-
-        # Skip the check if no partitions are linked
-        if len(partition_names) == 0:
-            _LOGGER.debug("Skipping %s armed check, no definition", key)
-            return False
-
-        descriptions = enumerate(self._partition_descriptions)
-        to_check = (idx for idx, name in descriptions if name in partition_names)
-
-        _LOGGER.debug("Checking %s (%s) for %s", partition_names, to_check, key)
-
-        for idx in to_check:
-            if (
-                self._coordinator.data[DATA_PARTITIONS][idx]["status"]
-                not in self.ARMED_STATUS
-            ):
-                return False
-
-        return True
-
     async def __command(self, key: str, code: str | None = None) -> None:
         """Send arm home command."""
         scenario_name = self._options[key]
@@ -199,9 +257,7 @@ class LaresAlarmControlPanel(CoordinatorEntity, AlarmControlPanelEntity):
             _LOGGER.warning("Skipping command, no definition for %s", key)
             return
 
-        descriptions = enumerate(self._scenario_descriptions)
-        match_gen = (idx for idx, name in descriptions if name == scenario_name)
-        matches = list(match_gen)
+        matches = self._scenario_indexes[key]
 
         if len(matches) != 1:
             _LOGGER.error("No match for %s (%s found)", key, len(matches))
@@ -210,4 +266,23 @@ class LaresAlarmControlPanel(CoordinatorEntity, AlarmControlPanelEntity):
         scenario = matches[0]
         _LOGGER.debug("Activating scenario %s", scenario)
 
-        await self._coordinator.client.activate_scenario(scenario, code)
+        if not await self._coordinator.client.activate_scenario(scenario, code):
+            return
+
+        reported = self._reported_state
+
+        if reported != self.COMMAND_STATES[key]:
+            self.__clear_optimistic()
+            self._optimistic_state = (
+                AlarmControlPanelState.DISARMING
+                if key == CONF_SCENARIO_DISARM
+                else AlarmControlPanelState.ARMING
+            )
+            self._optimistic_from = reported
+            self._optimistic_since = self.hass.loop.time()
+            self._unsub_rollback = async_call_later(
+                self.hass, OPTIMISTIC_TIMEOUT, self.__rollback
+            )
+            self.async_write_ha_state()
+
+        self._coordinator.async_request_burst(DATA_PARTITIONS)
@@ -1,23 +1,88 @@
 """Base component for Lares"""
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable, Mapping
+from contextlib import nullcontext
+from functools import partial
+import hashlib
+from http import HTTPStatus
 import logging
+import random
+import time
 from typing import Any
 
 import aiohttp
+import async_timeout
 from getmac import get_mac_address
-from lxml import etree
-from lxml.etree import Element
 
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, format_mac
 
-from .const import DOMAIN, MANUFACTURER
+from .const import (
+    CIRCUIT_BACKOFF_BASE,
+    CIRCUIT_BACKOFF_JITTER,
+    CIRCUIT_BACKOFF_MAX,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CONNECTION_KEEPALIVE_TIMEOUT,
+    CONNECTION_LIMIT_PER_HOST,
+    DATA_PARTITIONS,
+    DATA_SCENARIOS,
+    DATA_ZONES,
+    DEFAULT_TIMEOUT,
+    DOMAIN,
+    MANUFACTURER,
+    READ_ONLY_CACHE_TTL,
+    REQUEST_CONCURRENCY,
+)
+from .parser import (
+    parse_command,
+    parse_descriptions,
+    parse_document,
+    parse_general_info,
+    parse_partitions_status,
+    parse_scenarios,
+    parse_zones_status,
+)
+from .request_queue import LaresRequestQueue, PRIORITY_COMMAND, PRIORITY_POLL
+from .snapshot import StatusSnapshot
+from .stats import EndpointStats, LaresStats
+from .traffic import LaresTrafficRecorder, redact_path
 
 _LOGGER = logging.getLogger(__name__)
 
+# Reads the status, headers and body of a URL, sent with the given headers
+Transport = Callable[
+    [str, dict[str, str] | None], Awaitable[tuple[int, Mapping[str, str], bytes]]
+]
+
+# Response headers used for conditional requests, with their request header
+_VALIDATORS = {
+    "ETag": "If-None-Match",
+    "Last-Modified": "If-Modified-Since",
+}
+
+
+def _is_success(status: int) -> bool:
+    """Return if an HTTP status means the panel answered the request."""
+    return HTTPStatus.OK <= status < HTTPStatus.MULTIPLE_CHOICES or (
+        status == HTTPStatus.NOT_MODIFIED
+    )
+
+
+class PanelUnavailable(HomeAssistantError):
+    """Error to indicate the panel is unreachable and commands are not sent."""
+
 
 class LaresBase:
     """The implementation of the Lares base class."""
 
-    def __init__(self, data: dict) -> None:
+    def __init__(
+        self,
+        data: dict,
+        connector: aiohttp.BaseConnector | None = None,
+        shared_queue: LaresRequestQueue | None = None,
+        transport: Transport | None = None,
+    ) -> None:
         username = data["username"]
         password = data["password"]
         host = data["host"]
@@ -27,19 +92,64 @@ class LaresBase:
         self._ip = host
         self._port = port
         self._host = f"http://{host}:{self._port}"
+        self._mac = data.get("mac")
+        self._info = None
+        self._info_lock = asyncio.Lock()
         self._model = None
         self._zone_descriptions = None
         self._partition_descriptions = None
         self._scenario_descriptions = None
+        self._session: aiohttp.ClientSession | None = None
+        self._connector = connector
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._cache: dict[str, tuple[float, Any]] = {}
+
+        # Last digest, parsed result and cache validators per path
+        self._responses: dict[str, tuple[bytes, Any, dict[str, str]]] = {}
+        self.counters: Counter[str] = Counter()
+        self.stats = LaresStats()
+
+        # Circuit breaker, opened after consecutive failed requests
+        self._failures = 0
+        self._open_until = 0.0
+        self._probe: asyncio.Task | None = None
+
+        # The panel serves parallel requests poorly, commands go before polls
+        self._queue = LaresRequestQueue(REQUEST_CONCURRENCY)
+
+        # Optional limit of the requests of all panels together
+        self._shared_queue = shared_queue
+
+        # Requests go to the panel, unless another transport replays them
+        self._transport: Transport = transport or self._read_now
+        self.recorder: LaresTrafficRecorder | None = None
 
     async def info(self) -> dict | None:
-        """Get general info"""
-        response = await self.get("info/generalInfo.xml")
+        """Get general info, fetched once for the life of the client"""
+        async with self._info_lock:
+            if self._info is None:
+                self._info = await self._fetch_info()
+
+        return self._info
+
+    async def _fetch_info(self) -> dict | None:
+        """Fetch general info and resolve the MAC address"""
+        response = await self.get(
+            "info/generalInfo.xml", READ_ONLY_CACHE_TTL, parse_general_info
+        )
 
         if response is None:
             return None
 
-        mac = get_mac_address(ip=self._ip)
+        mac = self._mac
+
+        if mac is None:
+            # ARP lookup is blocking, keep it off the event loop
+            mac = await asyncio.get_running_loop().run_in_executor(
+                None, partial(get_mac_address, ip=self._ip)
+            )
+            self._mac = mac
+
         unique_id = str(mac)
 
         if mac is None:
@@ -49,11 +159,7 @@ class LaresBase:
         info = {
             "mac": mac,
             "id": unique_id,
-            "name": response.xpath("/generalInfo/productName")[0].text,
-            "info": response.xpath("/generalInfo/info1")[0].text,
-            "version": response.xpath("/generalInfo/productHighRevision")[0].text,
-            "revision": response.xpath("/generalInfo/productLowRevision")[0].text,
-            "build": response.xpath("/generalInfo/productBuildRevision")[0].text,
+            **response,
         }
 
         return info
@@ -81,88 +187,68 @@ class LaresBase:
 
         return info
 
-    async def zone_descriptions(self):
+    async def zone_descriptions(self, refresh: bool = False):
         """Get available zones"""
         model = await self.get_model()
-        if self._zone_descriptions is None:
-            self._zone_descriptions = await self.get_descriptions(
+        if self._zone_descriptions is None or refresh:
+            descriptions = await self.get_descriptions(
                 f"zones/zonesDescription{model}.xml", "/zonesDescription/zone"
             )
 
+            if descriptions is not None:
+                self._zone_descriptions = descriptions
+
         return self._zone_descriptions
 
-    async def zones(self):
+    def preload_descriptions(self, descriptions: dict) -> None:
+        """Use previously stored zone, partition and scenario descriptions"""
+        self._zone_descriptions = descriptions[DATA_ZONES]
+        self._partition_descriptions = descriptions[DATA_PARTITIONS]
+        self._scenario_descriptions = descriptions[DATA_SCENARIOS]
+
+    async def zones(self) -> StatusSnapshot | None:
         """Get available zones"""
         model = await self.get_model()
-        response = await self.get(f"zones/zonesStatus{model}.xml")
-
-        if response is None:
-            return None
-
-        zones = response.xpath("/zonesStatus/zone")
-
-        return [
-            {
-                "status": zone.find("status").text,
-                "bypass": zone.find("bypass").text,
-            }
-            for zone in zones
-        ]
+        return await self.get(
+            f"zones/zonesStatus{model}.xml", parser=parse_zones_status
+        )
 
-    async def partition_descriptions(self):
+    async def partition_descriptions(self, refresh: bool = False):
         """Get available partitions"""
         model = await self.get_model()
 
-        if self._partition_descriptions is None:
-            self._partition_descriptions = await self.get_descriptions(
+        if self._partition_descriptions is None or refresh:
+            descriptions = await self.get_descriptions(
                 f"partitions/partitionsDescription{model}.xml",
                 "/partitionsDescription/partition",
             )
 
+            if descriptions is not None:
+                self._partition_descriptions = descriptions
+
         return self._partition_descriptions
 
-    async def partitions(self):
+    async def partitions(self) -> StatusSnapshot | None:
         """Get status of partitions"""
         model = await self.get_model()
-        response = await self.get(f"partitions/partitionsStatus{model}.xml")
-
-        if response is None:
-            return None
-
-        partitions = response.xpath("/partitionsStatus/partition")
-
-        return [
-            {
-                "status": partition.text,
-            }
-            for partition in partitions
-        ]
+        return await self.get(
+            f"partitions/partitionsStatus{model}.xml", parser=parse_partitions_status
+        )
 
     async def scenarios(self):
         """Get status of scenarios"""
-        response = await self.get("scenarios/scenariosOptions.xml")
-
-        if response is None:
-            return None
+        return await self.get("scenarios/scenariosOptions.xml", parser=parse_scenarios)
 
-        scenarios = response.xpath("/scenariosOptions/scenario")
-
-        return [
-            {
-                "id": idx,
-                "enabled": scenario.find("abil").text == "TRUE",
-                "noPin": scenario.find("nopin").text == "TRUE",
-            }
-            for idx, scenario in enumerate(scenarios)
-        ]
-
-    async def scenario_descriptions(self):
+    async def scenario_descriptions(self, refresh: bool = False):
         """Get descriptions of scenarios"""
-        if self._scenario_descriptions is None:
-            self._scenario_descriptions = await self.get_descriptions(
+        if self._scenario_descriptions is None or refresh:
+            descriptions = await self.get_descriptions(
                 "scenarios/scenariosDescription.xml", "/scenariosDescription/scenario"
             )
 
+            if descriptions is not None:
+                self._scenario_descriptions = descriptions
+
         return self._scenario_descriptions
 
     async def activate_scenario(self, scenario: int, code: str) -> bool:
@@ -182,15 +268,35 @@ class LaresBase:
 
         return await self.send_command("setByPassZone", code, params)
 
-    async def get_descriptions(self, path: str, element: str) -> dict | None:
-        """Get descriptions"""
-        response = await self.get(path)
+    async def bypass_zones(
+        self, zones: list[int], code: str, bypass: bool
+    ) -> dict[int, bool]:
+        """Bypass or unbypass several zones, returns if each command was sent.
 
-        if response is None:
-            return None
+        The commands wait in the request queue together, ahead of any poll, and
+        are sent one after the other over the same connection.
+        """
+        results = await asyncio.gather(
+            *(self.bypass_zone(zone, code, bypass) for zone in zones),
+            return_exceptions=True,
+        )
 
-        content = response.xpath(element)
-        return [item.text for item in content]
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(
+                result, PanelUnavailable
+            ):
+                raise result
+
+        if results and all(isinstance(result, PanelUnavailable) for result in results):
+            raise results[0]
+
+        return {zone: result is True for zone, result in zip(zones, results)}
+
+    async def get_descriptions(self, path: str, element: str) -> list | None:
+        """Get descriptions"""
+        return await self.get(
+            path, READ_ONLY_CACHE_TTL, partial(parse_descriptions, element)
+        )
 
     async def get_model(self) -> str:
         """Get model information"""
@@ -210,30 +316,336 @@ class LaresBase:
         urlparam = "".join(f'&{k}={v}' for k,v in params.items())
         path = f"cmd/cmdOk.xml?cmd={command}&pin={code}&redirectPage=/xml/cmd/cmdError.xml{urlparam}"
 
-        _LOGGER.debug("Sending command %s", path)
+        _LOGGER.debug("Sending command %s", redact_path(path))
 
-        response = await self.get(path)
-        cmd = response.xpath("/cmd")
+        if not await self._circuit_allows():
+            self.stats.commands_failed += 1
+            raise PanelUnavailable(f"Alarm panel at {self._ip} is unreachable")
 
-        if cmd is None or cmd[0].text != "cmdSent":
+        # Commands are never shared with other requests
+        response = await self._fetch(path, parse_command, priority=PRIORITY_COMMAND)
+
+        if response is None:
+            _LOGGER.error("Command send failed, no response")
+            self.stats.commands_failed += 1
+            return False
+
+        if response != "cmdSent":
             _LOGGER.error("Command send failed: %s", response)
+            self.stats.commands_failed += 1
             return False
 
+        self.stats.commands_sent += 1
         return True
 
-    async def get(self, path):
-        """Generic send method."""
-        url = f"{self._host}/xml/{path}"
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the long-lived session, creating it when needed."""
+        if self._session is None or self._session.closed:
+            connector = self._connector
+
+            # A shared connector is closed by its owner, not with this session
+            if connector is None:
+                connector = aiohttp.TCPConnector(
+                    limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                    keepalive_timeout=CONNECTION_KEEPALIVE_TIMEOUT,
+                )
+
+            self._session = aiohttp.ClientSession(
+                auth=self._auth,
+                connector=connector,
+                connector_owner=self._connector is None,
+                timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+            )
+
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+        self._session = None
+
+    async def _read(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        priority: int = PRIORITY_POLL,
+        stats: EndpointStats | None = None,
+    ) -> tuple[int, Mapping[str, str], bytes]:
+        """Read the raw response, waiting for a slot in the request queues.
+
+        The timeout and the latency added to the statistics start once the
+        request holds a slot, so waiting behind the other requests of the
+        panel does not count against them. That wait is recorded on its own.
+        """
+        shared_slot = (
+            nullcontext()
+            if self._shared_queue is None
+            else self._shared_queue.slot(priority)
+        )
+        loop = asyncio.get_running_loop()
+        queued = loop.time()
+
+        async with self._queue.slot(priority), shared_slot:
+            start = loop.time()
+            self.stats.queue_wait.add(start - queued)
+
+            async with async_timeout.timeout(DEFAULT_TIMEOUT):
+                if self.recorder is None:
+                    response = await self._transport(url, headers)
+                else:
+                    response = await self._read_recorded(url, headers)
+
+        if stats is not None:
+            latency = loop.time() - start
+            stats.latency.add(latency)
+
+            if priority == PRIORITY_POLL:
+                self.stats.poll_latency.add(latency)
+
+        return response
+
+    async def _read_recorded(
+        self, url: str, headers: dict[str, str] | None
+    ) -> tuple[int, Mapping[str, str], bytes]:
+        """Read the raw response, adding it to the recording."""
+        recorder = self.recorder
+        path = url.removeprefix(f"{self._host}/xml/")
+        start = time.monotonic()
+
+        try:
+            status, response_headers, body = await self._transport(url, headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            # Errors such as redirects include the full URL of a command
+            recorder.record(
+                path, time.monotonic() - start, error=redact_path(repr(err))
+            )
+            raise
+
+        recorder.record(path, time.monotonic() - start, status, body)
+
+        return status, response_headers, body
+
+    async def _read_now(
+        self, url: str, headers: dict[str, str] | None
+    ) -> tuple[int, Mapping[str, str], bytes]:
+        """Read the raw response, retrying once when a pooled connection went stale."""
+        session = self._get_session()
 
         try:
-            async with aiohttp.ClientSession(auth=self._auth) as session:
-                async with session.get(url=url) as response:
-                    xml = await response.read()
-                    content = etree.fromstring(xml)
-                    return content
+            async with session.get(url=url, headers=headers) as response:
+                return response.status, response.headers.copy(), await response.read()
+        except aiohttp.ClientConnectorError:
+            raise
+        except (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError):
+            # The panel closes idle keep-alive sockets without notice, retry on a
+            # fresh connection before giving up.
+            _LOGGER.debug("Host %s: Stale connection, reconnecting", self._host)
+
+        async with session.get(url=url, headers=headers) as response:
+            return response.status, response.headers.copy(), await response.read()
+
+    async def get(
+        self,
+        path: str,
+        cache_ttl: float | None = None,
+        parser: Callable[[bytes], Any] = parse_document,
+    ):
+        """Generic send method, sharing concurrent requests for the same path.
+
+        A path is always expected to be read with the same parser.
+        """
+        loop = asyncio.get_running_loop()
+
+        if cache_ttl is not None:
+            cached = self._cache.get(path)
+
+            if cached is not None and cached[0] > loop.time():
+                return cached[1]
+
+        task = self._inflight.get(path)
+
+        if task is None:
+            task = loop.create_task(self._fetch(path, parser, reuse=True))
+            task.add_done_callback(lambda _: self._inflight.pop(path, None))
+            self._inflight[path] = task
+
+        # Shield so a cancelled caller does not cancel the request for the others
+        content = await asyncio.shield(task)
+
+        if cache_ttl is not None and content is not None:
+            self._cache[path] = (loop.time() + cache_ttl, content)
+
+        return content
+
+    async def _fetch(
+        self,
+        path: str,
+        parser: Callable[[bytes], Any],
+        reuse: bool = False,
+        priority: int = PRIORITY_POLL,
+    ):
+        """Fetch and parse a single document.
+
+        With reuse, the previous parsed result is returned as is when the panel
+        reports the document as not modified or the body did not change.
+        """
+        url = f"{self._host}/xml/{path}"
+        previous = self._responses.get(path) if reuse else None
+        headers = previous[2] if previous is not None else None
+        stats = self.stats.endpoint(path)
+
+        if not await self._circuit_allows():
+            self.counters["short_circuited"] += 1
+            return None
 
+        stats.requests += 1
+
+        try:
+            status, response_headers, xml = await self._read(
+                url, headers, priority, stats
+            )
         except aiohttp.ClientConnectorError as conn_err:
             _LOGGER.debug("Host %s: Connection error %s", self._host, str(conn_err))
+            stats.errors += 1
+            self._record_failure()
+            return None
+        except asyncio.TimeoutError:
+            _LOGGER.debug("Host %s: Request timed out", self._host)
+            stats.timeouts += 1
+            self._record_failure()
+            return None
+        except aiohttp.ClientError as err:
+            _LOGGER.debug(
+                "Host %s: Request error %s", self._host, redact_path(repr(err))
+            )
+            stats.errors += 1
+            self._record_failure()
+            return None
         except:  # pylint: disable=bare-except
             _LOGGER.debug("Host %s: Unknown exception occurred", self._host)
+            stats.errors += 1
+            return None
+
+        if not _is_success(status):
+            # Server errors, a connection limit or a wrong password
+            _LOGGER.debug("Host %s: HTTP error %s", self._host, status)
+            stats.errors += 1
+            self._record_failure()
+            return None
+
+        self._record_success()
+
+        try:
+            if previous is not None and status == HTTPStatus.NOT_MODIFIED:
+                self.counters["not_modified"] += 1
+                stats.not_modified += 1
+                return previous[1]
+
+            if not reuse:
+                return self._parse(stats, parser, xml)
+
+            digest = hashlib.blake2b(xml, digest_size=16).digest()
+
+            if previous is not None and previous[0] == digest:
+                self.counters["unchanged"] += 1
+                stats.unchanged += 1
+                return previous[1]
+
+            content = self._parse(stats, parser, xml)
+            self.counters["parsed"] += 1
+
+            validators = {
+                request_header: response_headers[response_header]
+                for response_header, request_header in _VALIDATORS.items()
+                if response_header in response_headers
+            }
+            self._responses[path] = (digest, content, validators)
+
+            return content
+
+        except:  # pylint: disable=bare-except
+            _LOGGER.debug("Host %s: Unknown exception occurred", self._host)
+            stats.errors += 1
         return None
+
+    @property
+    def pending_requests(self) -> int:
+        """Return the number of requests waiting for the panel."""
+        return self._queue.pending
+
+    @staticmethod
+    def _parse(
+        stats: EndpointStats, parser: Callable[[bytes], Any], xml: bytes
+    ) -> Any:
+        """Parse a document, recording the time spent."""
+        start = time.perf_counter()
+
+        try:
+            return parser(xml)
+        finally:
+            stats.parse_time.add(time.perf_counter() - start)
+
+    @property
+    def available(self) -> bool:
+        """Return if the panel is considered reachable."""
+        return self._failures < CIRCUIT_FAILURE_THRESHOLD
+
+    def _record_failure(self) -> None:
+        """Count a failed request, opening the circuit after too many."""
+        self._failures += 1
+
+        if self.available:
+            return
+
+        # Exponential backoff with jitter, so many clients do not retry in sync
+        exponent = self._failures - CIRCUIT_FAILURE_THRESHOLD
+        backoff = min(CIRCUIT_BACKOFF_MAX, CIRCUIT_BACKOFF_BASE * 2**exponent)
+        backoff *= random.uniform(1 - CIRCUIT_BACKOFF_JITTER, 1)
+        self._open_until = asyncio.get_running_loop().time() + backoff
+
+        if exponent == 0:
+            _LOGGER.warning("Host %s: Unreachable, backing off", self._host)
+
+        _LOGGER.debug("Host %s: Retrying in %.1fs", self._host, backoff)
+
+    def _record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        if not self.available:
+            _LOGGER.info("Host %s: Reachable again", self._host)
+
+        self._failures = 0
+
+    async def _circuit_allows(self) -> bool:
+        """Return if a request may be sent, probing the panel when half-open."""
+        if self.available:
+            return True
+
+        loop = asyncio.get_running_loop()
+
+        if loop.time() < self._open_until:
+            return False
+
+        # A single cheap probe decides whether to resume normal requests
+        if self._probe is None:
+            self._probe = loop.create_task(self._probe_panel())
+
+        return await asyncio.shield(self._probe)
+
+    async def _probe_panel(self) -> bool:
+        """Probe the panel with the general info document."""
+        try:
+            status, _, _ = await self._read(f"{self._host}/xml/info/generalInfo.xml")
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self._record_failure()
+            return False
+        finally:
+            self._probe = None
+
+        if not _is_success(status):
+            self._record_failure()
+            return False
+
+        self._record_success()
+        return True
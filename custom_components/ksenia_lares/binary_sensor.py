@@ -1,5 +1,4 @@
 """This component provides support for Lares motion/door events."""
-from datetime import timedelta
 import logging
 
 
@@ -9,7 +8,7 @@ from homeassistant.helpers.update_coordinator import (
 )
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
@@ -19,12 +18,12 @@ from .const import (
     ZONE_STATUS_ALARM,
     ZONE_STATUS_NOT_USED,
     DATA_COORDINATOR,
+    DATA_DESCRIPTIONS,
+    DATA_DEVICE_INFO,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-SCAN_INTERVAL = timedelta(seconds=10)
-
 DEFAULT_DEVICE_CLASS = "motion"
 
 
@@ -35,16 +34,14 @@ async def async_setup_entry(
 ) -> None:
     """Set up binary sensors attached to a Lares alarm device from a config entry."""
 
-    coordinator = hass.data[DOMAIN][config_entry.entry_id][DATA_COORDINATOR]
-    device_info = await coordinator.client.device_info()
-    zone_descriptions = await coordinator.client.zone_descriptions()
-
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_refresh()
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = entry_data[DATA_COORDINATOR]
+    device_info = entry_data[DATA_DEVICE_INFO]
+    zone_descriptions = entry_data[DATA_DESCRIPTIONS][DATA_ZONES]
 
     async_add_entities(
         LaresBinarySensor(coordinator, idx, zone_descriptions[idx], device_info)
-        for idx, zone in enumerate(coordinator.data[DATA_ZONES])
+        for idx in range(len(coordinator.data[DATA_ZONES]))
     )
 
 
@@ -53,7 +50,7 @@ class LaresBinarySensor(CoordinatorEntity, BinarySensorEntity):
 
     def __init__(self, coordinator, idx, description, device_info) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=(DATA_ZONES, idx))
 
         self._coordinator = coordinator
         self._description = description
@@ -62,14 +59,11 @@ class LaresBinarySensor(CoordinatorEntity, BinarySensorEntity):
         self._attr_device_info = device_info
         self._attr_device_class = DEFAULT_DEVICE_CLASS
 
-        # Hide sensor if it is indicated as not used
-        is_used = (
-            self._coordinator.data[DATA_ZONES][self._idx]["status"]
-            != ZONE_STATUS_NOT_USED
-        )
+        self.__update_state()
 
-        self._attr_entity_registry_enabled_default = is_used
-        self._attr_entity_registry_visible_default = is_used
+        # Hide sensor if it is indicated as not used
+        self._attr_entity_registry_enabled_default = self._attr_available
+        self._attr_entity_registry_visible_default = self._attr_available
 
     @property
     def unique_id(self):
@@ -81,16 +75,24 @@ class LaresBinarySensor(CoordinatorEntity, BinarySensorEntity):
         """Return the name of this camera."""
         return self._description
 
-    @property
-    def is_on(self):
-        """Return the state of the sensor."""
-        return (
-            self._coordinator.data[DATA_ZONES][self._idx]["status"] == ZONE_STATUS_ALARM
-        )
-
     @property
     def available(self):
         """Return True if entity is available."""
-        status = self._coordinator.data[DATA_ZONES][self._idx]["status"]
+        return self._attr_available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the zone changed what this sensor shows."""
+        if self.__update_state():
+            self.async_write_ha_state()
+
+    def __update_state(self) -> bool:
+        """Derive the state from the zone status, return whether it changed."""
+        status = self._coordinator.data[DATA_ZONES].status(self._idx)
+        state = (status == ZONE_STATUS_ALARM, status != ZONE_STATUS_NOT_USED)
+
+        if state == (self._attr_is_on, self._attr_available):
+            return False
 
-        return status != ZONE_STATUS_NOT_USED
+        self._attr_is_on, self._attr_available = state
+        return True
@@ -15,8 +15,10 @@ from homeassistant.config_entries import (
 from homeassistant.core import callback, HomeAssistant
 
 from .base import LaresBase
+from .store import LaresDescriptionStore
 from .const import (
     DOMAIN,
+    DATA_COORDINATOR,
     CONF_PARTITION_AWAY,
     CONF_PARTITION_HOME,
     CONF_PARTITION_NIGHT,
@@ -24,7 +26,16 @@ from .const import (
     CONF_SCENARIO_AWAY,
     CONF_SCENARIO_NIGHT,
     CONF_SCENARIO_DISARM,
-    CONF_PIN
+    CONF_PIN,
+    CONF_ADAPTIVE_POLLING,
+    CONF_SCAN_INTERVAL_ZONES,
+    CONF_SCAN_INTERVAL_PARTITIONS,
+    CONF_SCAN_INTERVAL_SCENARIOS,
+    CONF_SCAN_INTERVAL_DESCRIPTIONS,
+    DEFAULT_SCAN_INTERVAL_ZONES,
+    DEFAULT_SCAN_INTERVAL_PARTITIONS,
+    DEFAULT_SCAN_INTERVAL_SCENARIOS,
+    DEFAULT_SCAN_INTERVAL_DESCRIPTIONS,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -46,13 +57,16 @@ async def validate_input(hass: HomeAssistant, data):
     """
     client = LaresBase(data)
 
-    info = await client.info()
+    try:
+        info = await client.info()
+    finally:
+        await client.close()
 
     if info is None:
         raise InvalidAuth
 
     # Return info that you want to store in the config entry.
-    return {"title": info["name"], "id": info["id"]}
+    return {"title": info["name"], "id": info["id"], "mac": info["mac"]}
 
 
 class LaresConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -91,7 +105,12 @@ class LaresConfigFlow(ConfigFlow, domain=DOMAIN):
             await self.async_set_unique_id(str(info["id"]))
             self._abort_if_unique_id_configured()
 
-            return self.async_create_entry(title=info["title"], data=user_input)
+            data = {**user_input}
+
+            if info["mac"] is not None:
+                data["mac"] = info["mac"]
+
+            return self.async_create_entry(title=info["title"], data=data)
 
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
@@ -103,7 +122,6 @@ class LaresOptionsFlowHandler(OptionsFlow):
     def __init__(self, config_entry: ConfigEntry) -> None:
         """Initialize options flow."""
         self.config_entry = config_entry
-        self.client = LaresBase(config_entry.data)
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
@@ -112,10 +130,9 @@ class LaresOptionsFlowHandler(OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
-        partitions = await self.client.partition_descriptions()
+        partitions, scenarios = await self._async_get_descriptions()
         select_partitions = {v: v for v in list(filter(None, partitions)) if v != ""}
 
-        scenarios = await self.client.scenario_descriptions()
         scenarios_with_empty = [""] + scenarios
 
         options = {
@@ -148,10 +165,66 @@ class LaresOptionsFlowHandler(OptionsFlow):
                 CONF_SCENARIO_NIGHT,
                 default=self.config_entry.options.get(CONF_SCENARIO_NIGHT, ""),
             ): vol.In(scenarios_with_empty),
+            vol.Required(
+                CONF_SCAN_INTERVAL_ZONES,
+                default=self.config_entry.options.get(
+                    CONF_SCAN_INTERVAL_ZONES, DEFAULT_SCAN_INTERVAL_ZONES
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Required(
+                CONF_SCAN_INTERVAL_PARTITIONS,
+                default=self.config_entry.options.get(
+                    CONF_SCAN_INTERVAL_PARTITIONS, DEFAULT_SCAN_INTERVAL_PARTITIONS
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Required(
+                CONF_SCAN_INTERVAL_SCENARIOS,
+                default=self.config_entry.options.get(
+                    CONF_SCAN_INTERVAL_SCENARIOS, DEFAULT_SCAN_INTERVAL_SCENARIOS
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Required(
+                CONF_SCAN_INTERVAL_DESCRIPTIONS,
+                default=self.config_entry.options.get(
+                    CONF_SCAN_INTERVAL_DESCRIPTIONS, DEFAULT_SCAN_INTERVAL_DESCRIPTIONS
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+            vol.Required(
+                CONF_ADAPTIVE_POLLING,
+                default=self.config_entry.options.get(CONF_ADAPTIVE_POLLING, False),
+            ): bool,
         }
 
         return self.async_show_form(step_id="init", data_schema=vol.Schema(options))
 
+    async def _async_get_descriptions(self) -> tuple[list, list]:
+        """Get partition and scenario descriptions, preferably without the panel."""
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+
+        # Reuse the descriptions already loaded by the running integration
+        if entry_data is not None:
+            client = entry_data[DATA_COORDINATOR].client
+            return (
+                await client.partition_descriptions(),
+                await client.scenario_descriptions(),
+            )
+
+        client = LaresBase(self.config_entry.data)
+        store = LaresDescriptionStore(self.hass, self.config_entry.entry_id, client)
+
+        try:
+            descriptions = await store.async_load()
+
+            if descriptions is not None:
+                client.preload_descriptions(descriptions)
+
+            return (
+                await client.partition_descriptions(),
+                await client.scenario_descriptions(),
+            )
+        finally:
+            await client.close()
+
 
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
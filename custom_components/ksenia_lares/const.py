@@ -3,9 +3,44 @@
 DOMAIN = "ksenia_lares"
 MANUFACTURER = "KSENIA"
 DEFAULT_TIMEOUT = 10
+# Budget of fetching a resource, including the wait for a request slot behind
+# the other requests of an update: three status documents and three
+# description documents of DEFAULT_TIMEOUT at most
+FETCH_TIMEOUT = DEFAULT_TIMEOUT * 6
+STORAGE_VERSION = 1
+
+CONNECTION_LIMIT_PER_HOST = 2
+CONNECTION_KEEPALIVE_TIMEOUT = 30
+READ_ONLY_CACHE_TTL = 5
+REQUEST_CONCURRENCY = 1
+
+# Shared by all panels of a Home Assistant instance
+GLOBAL_CONNECTION_LIMIT = 32
+GLOBAL_REQUEST_CONCURRENCY = 8
+
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_BACKOFF_BASE = 10
+CIRCUIT_BACKOFF_MAX = 300
+CIRCUIT_BACKOFF_JITTER = 0.5
+
+# Number of latest samples kept per measurement
+STATS_WINDOW = 100
+
+TRAFFIC_FORMAT_VERSION = 1
+TRAFFIC_MAX_ENTRIES = 100000
+TRAFFIC_MAX_DURATION = 3600
 
 DATA_ZONES = "ZONES"
 DATA_PARTITIONS = "PARTITIONS"
+DATA_SCENARIOS = "SCENARIOS"
+DATA_DESCRIPTIONS = "DESCRIPTIONS"
+DATA_STALE = "STALE"
+
+EVENT_ZONE_CHANGED = f"{DOMAIN}_zone_changed"
+EVENT_PARTITION_CHANGED = f"{DOMAIN}_partition_changed"
+
+# Number of latest zone and partition transitions kept in memory
+RECENT_EVENTS_SIZE = 256
 
 ZONE_STATUS_ALARM = "ALARM"
 ZONE_STATUS_NORMAL = "NORMAL"
@@ -21,8 +56,35 @@ PARTITION_STATUS_ARMING = "EXIT"
 PARTITION_STATUS_PENDING = "PREALARM"
 PARTITION_STATUS_ALARM = "ALARM"
 
+ADAPTIVE_ACTIVE_STATUS = [
+    PARTITION_STATUS_ARMING,
+    PARTITION_STATUS_PENDING,
+    PARTITION_STATUS_ALARM,
+]
+ADAPTIVE_ACTIVE_INTERVAL = 1
+ADAPTIVE_IDLE_INTERVAL = 30
+ADAPTIVE_TRANSITION_WINDOW = 30
+
+COMMAND_BURST_DELAYS = [0.5, 1, 1, 2]
+OPTIMISTIC_TIMEOUT = 10
+
 CONF_PIN = "pin"
 
+CONF_SCAN_INTERVAL_ZONES = "scan_interval_zones"
+CONF_SCAN_INTERVAL_PARTITIONS = "scan_interval_partitions"
+CONF_SCAN_INTERVAL_SCENARIOS = "scan_interval_scenarios"
+CONF_SCAN_INTERVAL_DESCRIPTIONS = "scan_interval_descriptions"
+
+DEFAULT_SCAN_INTERVAL_ZONES = 2
+DEFAULT_SCAN_INTERVAL_PARTITIONS = 5
+DEFAULT_SCAN_INTERVAL_SCENARIOS = 60
+DEFAULT_SCAN_INTERVAL_DESCRIPTIONS = 86400
+
+# Delay before retrying a failed revalidation of the descriptions
+DESCRIPTIONS_RETRY_INTERVAL = 60
+
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+
 CONF_PARTITION_AWAY = "partition_away"
 CONF_PARTITION_HOME = "partition_home"
 CONF_PARTITION_NIGHT = "partition_night"
@@ -33,4 +95,6 @@ CONF_SCENARIO_NIGHT = "scenario_night"
 CONF_SCENARIO_DISARM = "scenario_disarm"
 
 DATA_COORDINATOR = "coordinator"
+DATA_DEVICE_INFO = "device_info"
 DATA_UPDATE_LISTENER = "update_listener"
+DATA_MANAGER = f"{DOMAIN}_manager"
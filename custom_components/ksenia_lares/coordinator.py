@@ -1,35 +1,516 @@
 """The Ksenia Lares data update coordinator."""
-from datetime import timedelta
+import asyncio
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable, Mapping
+from datetime import datetime, timedelta
+import itertools
 import logging
+import math
+from typing import Any
+
 import async_timeout
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .base import LaresBase
-from .const import DEFAULT_TIMEOUT, DATA_PARTITIONS, DATA_ZONES
+from .stats import RollingHistogram
+from .store import LaresDescriptionStore
+from .const import (
+    ADAPTIVE_ACTIVE_INTERVAL,
+    ADAPTIVE_ACTIVE_STATUS,
+    ADAPTIVE_IDLE_INTERVAL,
+    ADAPTIVE_TRANSITION_WINDOW,
+    CONF_ADAPTIVE_POLLING,
+    CONF_SCAN_INTERVAL_DESCRIPTIONS,
+    CONF_SCAN_INTERVAL_PARTITIONS,
+    CONF_SCAN_INTERVAL_SCENARIOS,
+    CONF_SCAN_INTERVAL_ZONES,
+    COMMAND_BURST_DELAYS,
+    DATA_DESCRIPTIONS,
+    DATA_PARTITIONS,
+    DATA_SCENARIOS,
+    DATA_STALE,
+    DATA_ZONES,
+    DEFAULT_SCAN_INTERVAL_DESCRIPTIONS,
+    DEFAULT_SCAN_INTERVAL_PARTITIONS,
+    DEFAULT_SCAN_INTERVAL_SCENARIOS,
+    DEFAULT_SCAN_INTERVAL_ZONES,
+    DESCRIPTIONS_RETRY_INTERVAL,
+    EVENT_PARTITION_CHANGED,
+    EVENT_ZONE_CHANGED,
+    FETCH_TIMEOUT,
+    PARTITION_STATUS_DISARMED,
+    RECENT_EVENTS_SIZE,
+)
 
-SCAN_INTERVAL = timedelta(seconds=10)
 _LOGGER = logging.getLogger(__name__)
 
+# Shared result of a diff without changes, so unchanged polls allocate nothing
+_UNCHANGED: frozenset = frozenset()
+
 
 class LaresDataUpdateCoordinator(DataUpdateCoordinator):
     """Coordinate for data updates from Ksenia Lares."""
 
-    def __init__(self, hass: HomeAssistant, client: LaresBase) -> None:
-        """Initialize."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: LaresBase,
+        options: Mapping[str, Any],
+        store: LaresDescriptionStore,
+        slot: int = 0,
+    ) -> None:
+        """Initialize, offsetting the polls by the slot of the panel."""
+        self.client = client
+        self._store = store
+        self._slot = slot
+
+        # Each resource is polled on its own interval (in seconds), the
+        # coordinator ticks at the fastest of them.
+        self._fetchers: dict[str, Callable[[], Awaitable[Any]]] = {
+            DATA_ZONES: client.zones,
+            DATA_PARTITIONS: client.partitions,
+            DATA_SCENARIOS: client.scenarios,
+            DATA_DESCRIPTIONS: self._async_fetch_descriptions,
+        }
+        self._intervals = {
+            DATA_ZONES: options.get(
+                CONF_SCAN_INTERVAL_ZONES, DEFAULT_SCAN_INTERVAL_ZONES
+            ),
+            DATA_PARTITIONS: options.get(
+                CONF_SCAN_INTERVAL_PARTITIONS, DEFAULT_SCAN_INTERVAL_PARTITIONS
+            ),
+            DATA_SCENARIOS: options.get(
+                CONF_SCAN_INTERVAL_SCENARIOS, DEFAULT_SCAN_INTERVAL_SCENARIOS
+            ),
+            DATA_DESCRIPTIONS: options.get(
+                CONF_SCAN_INTERVAL_DESCRIPTIONS, DEFAULT_SCAN_INTERVAL_DESCRIPTIONS
+            ),
+        }
+        self._current_intervals = dict(self._intervals)
+        self._last_poll = {key: float("-inf") for key in self._fetchers}
+        self._tick = min(self._intervals.values())
+
+        # Adaptive polling speeds up zones and partitions while the alarm needs
+        # attention and slows them down when everything is disarmed and quiet.
+        self._adaptive = options.get(CONF_ADAPTIVE_POLLING, False)
+        self._active_until = float("-inf")
+
+        self._burst_tasks: dict[str, asyncio.Task] = {}
+        self._descriptions_task: asyncio.Task | None = None
+
+        # Listener contexts changed by the last update, None to notify all
+        self._changed: frozenset | set | None = None
+        # Listeners with their context, kept here rather than read from the
+        # private registry of the base class
+        self._context_listeners: dict[
+            CALLBACK_TYPE, tuple[CALLBACK_TYPE, Any]
+        ] = {}
+
+        # Health of the updates, for the diagnostic sensors
+        self.consecutive_failures = 0
+        self.last_update_success_time: datetime | None = None
+        self.update_duration = RollingHistogram()
+        self.timeouts: Counter[str] = Counter()
+
+        # Latest transitions as (time, key, index, old status, new status,
+        # bypass), the bypass is None for partitions
+        self._recent_events: deque[
+            tuple[datetime, str, int, str, str, bool | None]
+        ] = deque(maxlen=RECENT_EVENTS_SIZE)
+
+        # Transitions of the data being published, handled once the listeners
+        # were updated so automations see the new entity states
+        self._pending_transitions: tuple[dict, dict, set, datetime] | None = None
+
         super().__init__(
             hass,
             _LOGGER,
             name="Ksenia Lares",
-            update_interval=SCAN_INTERVAL,
+            update_interval=timedelta(seconds=self._tick),
+            # Unchanged documents return the previous objects, skip those updates
+            always_update=False,
         )
-        self.client = client
 
     async def _async_update_data(self) -> dict:
-        """Fetch data from Ksenia Lares client."""
-        async with async_timeout.timeout(DEFAULT_TIMEOUT):
-            zones = await self.client.zones()
-            partitions = await self.client.partitions()
+        """Fetch the resources that are due from Ksenia Lares client."""
+        now = self.hass.loop.time()
+        polled_at = dt_util.utcnow()
+
+        # Notify every entity unless this update completes successfully
+        self._changed = None
+
+        # Allow half a tick of slack so timer jitter does not skip a cycle
+        due = [
+            key
+            for key, last_poll in self._last_poll.items()
+            if last_poll + self._current_intervals[key] <= now + self._tick / 2
+        ]
+
+        if DATA_DESCRIPTIONS in due and self.data is not None:
+            # The description documents are slow, do not hold back the status
+            due.remove(DATA_DESCRIPTIONS)
+            self._async_revalidate_descriptions()
+
+        results = await asyncio.gather(
+            *(self._async_fetch(key, self._fetchers[key]) for key in due)
+        )
+        self.update_duration.add(self.hass.loop.time() - now)
+
+        if due and all(result is None for result in results):
+            self.consecutive_failures += 1
+            raise UpdateFailed("Unable to fetch data from Ksenia Lares")
+
+        self.consecutive_failures = 0
+        self.last_update_success_time = polled_at
+        descriptions = dict(zip(due, results)).get(DATA_DESCRIPTIONS)
+        # Descriptions from disk are revalidated on the next tick
+        revalidate = self.data is None and self._store.loaded
+
+        if descriptions is not None:
+            await self._store.async_save(descriptions)
+
+        # Build on the data published by now, a burst may have published
+        # while these requests were in flight
+        previous = self.data or {}
+        data = {key: previous.get(key) for key in self._fetchers}
+        stale = set(previous.get(DATA_STALE, set()))
+
+        for key, result in zip(due, results):
+            if self._last_poll[key] > now:
+                # A request sent after this one was published meanwhile
+                continue
+
+            if result is None:
+                # Keep publishing the last known value, marked as stale
+                stale.add(key)
+                continue
+
+            data[key] = result
+            stale.discard(key)
+
+            if self._last_poll[key] == float("-inf"):
+                # Start the schedule of a resource at the offset of the panel
+                self._last_poll[key] = now - self._offset(key)
+            else:
+                self._last_poll[key] = now
+
+        data[DATA_STALE] = stale
+
+        if revalidate:
+            self._last_poll[DATA_DESCRIPTIONS] = float("-inf")
+
+        if self._adaptive:
+            self._update_polling_mode(now, previous, data)
+
+        changed = self._diff(previous, data)
+
+        if changed:
+            self._pending_transitions = (previous, data, changed, polled_at)
+
+        if self.last_update_success:
+            self._changed = changed
+
+        return data
+
+    def _offset(self, key: str) -> float:
+        """Return the offset of the polls of a resource, in whole ticks.
+
+        Panels in consecutive slots poll a resource on consecutive ticks,
+        until every tick of its interval is taken.
+        """
+        # A resource is due half a tick early, see _async_update_data
+        ticks = max(1, math.ceil(self._current_intervals[key] / self._tick - 0.5))
+
+        return self._slot % ticks * self._tick
+
+    @staticmethod
+    def _diff(previous: dict, data: dict) -> frozenset | set | None:
+        """Return the listener contexts of the zones and partitions that changed."""
+        changed = _UNCHANGED
+
+        for key in (DATA_ZONES, DATA_PARTITIONS):
+            old = previous.get(key)
+            new = data.get(key)
+
+            if old is new:
+                continue
+
+            indexes = old.diff(new) if old is not None and new is not None else None
+
+            if indexes is None:
+                return None
+
+            if indexes:
+                if changed is _UNCHANGED:
+                    changed = set()
+
+                changed.add(key)
+                changed.update((key, idx) for idx in indexes)
+
+        return changed
+
+    @callback
+    def _async_handle_transitions(
+        self, previous: dict, data: dict, changed: set, polled_at: datetime
+    ) -> None:
+        """Keep and fire an event for every zone and partition that changed."""
+        entry_id = self.config_entry.entry_id if self.config_entry else None
+        descriptions = data.get(DATA_DESCRIPTIONS) or {}
+        timestamp = polled_at.isoformat()
+
+        for context in sorted(item for item in changed if isinstance(item, tuple)):
+            key, idx = context
+            old = previous[key]
+            new = data[key]
+            old_status = old.status(idx)
+            new_status = new.status(idx)
+            names = descriptions.get(key)
+            event_data = {
+                "config_entry_id": entry_id,
+                "name": names[idx] if names and idx < len(names) else None,
+                "old_status": old_status,
+                "new_status": new_status,
+                "timestamp": timestamp,
+            }
+
+            if key == DATA_ZONES:
+                bypass = new.is_bypassed(idx)
+                event_data["zone"] = idx
+                event_data["old_bypass"] = old.is_bypassed(idx)
+                event_data["bypass"] = bypass
+                self.hass.bus.async_fire(EVENT_ZONE_CHANGED, event_data)
+            else:
+                bypass = None
+                event_data["partition"] = idx
+                self.hass.bus.async_fire(EVENT_PARTITION_CHANGED, event_data)
+
+            self._recent_events.append(
+                (polled_at, key, idx, old_status, new_status, bypass)
+            )
+
+    def recent_events(self, limit: int | None = None) -> list[dict]:
+        """Return the latest zone and partition transitions, oldest first."""
+        events = self._recent_events
+        start = 0 if limit is None else max(0, len(events) - limit)
+        descriptions = (self.data or {}).get(DATA_DESCRIPTIONS) or {}
+        result = []
+
+        for polled_at, key, index, old_status, new_status, bypass in itertools.islice(
+            events, start, None
+        ):
+            names = descriptions.get(key)
+            event = {
+                "timestamp": polled_at.isoformat(),
+                "type": "zone" if key == DATA_ZONES else "partition",
+                "index": index,
+                "name": names[index] if names and index < len(names) else None,
+                "old_status": old_status,
+                "new_status": new_status,
+            }
+
+            if bypass is not None:
+                event["bypass"] = bypass
+
+            result.append(event)
+
+        return result
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> CALLBACK_TYPE:
+        """Listen for data updates, remembering the context of the listener."""
+        remove = super().async_add_listener(update_callback, context)
+        self._context_listeners[remove] = (update_callback, context)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the listener."""
+            self._context_listeners.pop(remove, None)
+            remove()
+
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only the listeners whose zone or partition changed."""
+        if self._changed is None:
+            super().async_update_listeners()
+        else:
+            for update_callback, context in list(self._context_listeners.values()):
+                if context is None or context in self._changed:
+                    update_callback()
+
+        if (transitions := self._pending_transitions) is not None:
+            self._pending_transitions = None
+            self._async_handle_transitions(*transitions)
+
+    def _update_polling_mode(self, now: float, previous: dict, data: dict) -> None:
+        """Adapt the zone and partition intervals to the state of the alarm."""
+        zones = data[DATA_ZONES]
+        partitions = data[DATA_PARTITIONS]
+        previous_zones = previous.get(DATA_ZONES)
+
+        if previous_zones is not None and previous_zones != zones:
+            self._active_until = now + ADAPTIVE_TRANSITION_WINDOW
+
+        if partitions is None:
+            return
+
+        statuses = set(partitions.statuses())
+
+        if now < self._active_until or partitions.has_status(ADAPTIVE_ACTIVE_STATUS):
+            mode = "active"
+        elif statuses <= {PARTITION_STATUS_DISARMED}:
+            mode = "idle"
+        else:
+            mode = "normal"
+
+        intervals = dict(self._current_intervals)
+
+        for key in (DATA_ZONES, DATA_PARTITIONS):
+            if mode == "active":
+                intervals[key] = min(self._intervals[key], ADAPTIVE_ACTIVE_INTERVAL)
+            elif mode == "idle":
+                intervals[key] = max(self._intervals[key], ADAPTIVE_IDLE_INTERVAL)
+            else:
+                intervals[key] = self._intervals[key]
+
+        if intervals == self._current_intervals:
+            return
+
+        _LOGGER.debug("Switching to %s polling", mode)
+
+        self._current_intervals = intervals
+        self._tick = min(intervals.values())
+        self.update_interval = timedelta(seconds=self._tick)
+
+    @callback
+    def async_request_burst(self, key: str) -> None:
+        """Refresh a single resource a few times in a row after a command."""
+        if (task := self._burst_tasks.get(key)) is not None:
+            task.cancel()
+
+        self._burst_tasks[key] = self.hass.async_create_task(
+            self._async_burst_refresh(key)
+        )
+
+    async def _async_burst_refresh(self, key: str) -> None:
+        """Poll the resource until it changes or the burst is exhausted."""
+        initial = self.data.get(key) if self.data is not None else None
+
+        try:
+            for delay in COMMAND_BURST_DELAYS:
+                await asyncio.sleep(delay)
+
+                result = await self.async_refresh_resource(key)
+
+                if result is not None and result != initial:
+                    break
+        finally:
+            self._burst_tasks.pop(key, None)
+
+    async def async_refresh_resource(self, key: str) -> Any | None:
+        """Fetch a single resource now and publish it, None when it failed."""
+        now = self.hass.loop.time()
+        polled_at = dt_util.utcnow()
+        result = await self._async_fetch(key, self._fetchers[key])
+
+        if result is None or self._last_poll[key] > now:
+            # Failed, or a request sent after this one was published meanwhile
+            return result
+
+        if key == DATA_DESCRIPTIONS:
+            await self._store.async_save(result)
+
+        previous = self.data or {}
+        data = {
+            **previous,
+            key: result,
+            DATA_STALE: previous.get(DATA_STALE, set()) - {key},
+        }
+        self._last_poll[key] = now
+
+        if self._adaptive:
+            self._update_polling_mode(now, previous, data)
+
+        changed = self._diff(previous, data)
+
+        if changed:
+            self._pending_transitions = (previous, data, changed, polled_at)
+
+        self._changed = changed if self.last_update_success else None
+        self.async_set_updated_data(data)
+
+        return result
+
+    @callback
+    def _async_revalidate_descriptions(self) -> None:
+        """Refresh the descriptions in the background, unless already running."""
+        if self._descriptions_task is not None and not self._descriptions_task.done():
+            return
+
+        self._descriptions_task = self.hass.async_create_task(
+            self._async_revalidate()
+        )
+
+    async def _async_revalidate(self) -> None:
+        """Refresh the descriptions, retrying after a delay when it failed."""
+        start = self.hass.loop.time()
+
+        if await self.async_refresh_resource(DATA_DESCRIPTIONS) is None:
+            # Not on every tick, the documents are slow and hold the request slot
+            self._last_poll[DATA_DESCRIPTIONS] = (
+                start
+                + DESCRIPTIONS_RETRY_INTERVAL
+                - self._current_intervals[DATA_DESCRIPTIONS]
+            )
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending bursts and revalidation, and stop polling."""
+        for task in list(self._burst_tasks.values()):
+            task.cancel()
+
+        if self._descriptions_task is not None:
+            self._descriptions_task.cancel()
+
+        await super().async_shutdown()
+
+    async def _async_fetch(
+        self, key: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any | None:
+        """Fetch a single resource within its own timeout.
+
+        Each request times out on its own once it holds a slot, this only
+        guards against waiting forever for one.
+        """
+        try:
+            async with async_timeout.timeout(FETCH_TIMEOUT):
+                return await fetch()
+        except asyncio.TimeoutError:
+            _LOGGER.debug("Timeout fetching %s", key)
+            self.timeouts[key] += 1
+            return None
+
+    async def _async_fetch_descriptions(self) -> dict | None:
+        """Fetch the zone, partition and scenario descriptions."""
+        # The first cycle can use what the client already loaded during setup
+        refresh = self.data is not None
+
+        zones, partitions, scenarios = await asyncio.gather(
+            self.client.zone_descriptions(refresh),
+            self.client.partition_descriptions(refresh),
+            self.client.scenario_descriptions(refresh),
+        )
+
+        if zones is None or partitions is None or scenarios is None:
+            return None
 
-            return {DATA_ZONES: zones, DATA_PARTITIONS: partitions}
+        return {
+            DATA_ZONES: zones,
+            DATA_PARTITIONS: partitions,
+            DATA_SCENARIOS: scenarios,
+        }
@@ -0,0 +1,57 @@
+"""Diagnostics support for Ksenia Lares."""
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_PIN,
+    DATA_COORDINATOR,
+    DATA_PARTITIONS,
+    DATA_STALE,
+    DATA_ZONES,
+    DOMAIN,
+)
+from .coordinator import LaresDataUpdateCoordinator
+
+TO_REDACT = {CONF_PASSWORD, CONF_PIN, CONF_USERNAME, "mac"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics of a config entry."""
+    coordinator: LaresDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
+        DATA_COORDINATOR
+    ]
+    client = coordinator.client
+    data = coordinator.data or {}
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "last_update_success_time": coordinator.last_update_success_time,
+            "consecutive_failures": coordinator.consecutive_failures,
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "update_duration": coordinator.update_duration.as_dict(),
+            "timeouts": dict(coordinator.timeouts),
+            "stale": sorted(data.get(DATA_STALE, ())),
+        },
+        "recent_events": coordinator.recent_events(),
+        "client": {
+            "available": client.available,
+            "pending_requests": client.pending_requests,
+            "counters": dict(client.counters),
+            "stats": client.stats.as_dict(),
+        },
+        "data": {
+            key: None if data.get(key) is None else data[key].statuses()
+            for key in (DATA_ZONES, DATA_PARTITIONS)
+        },
+    }
@@ -0,0 +1,83 @@
+"""Resources shared by all Lares panels of a Home Assistant instance."""
+import itertools
+import logging
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+
+from .base import LaresBase
+from .const import (
+    CONNECTION_KEEPALIVE_TIMEOUT,
+    CONNECTION_LIMIT_PER_HOST,
+    DATA_MANAGER,
+    GLOBAL_CONNECTION_LIMIT,
+    GLOBAL_REQUEST_CONCURRENCY,
+)
+from .request_queue import LaresRequestQueue
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LaresManager:
+    """Share a connection pool and a request limit between panels.
+
+    Every panel also gets its own slot, so the panels polled on the same
+    interval do not all fetch a document on the same tick.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._connector: aiohttp.TCPConnector | None = None
+        self._queue = LaresRequestQueue(GLOBAL_REQUEST_CONCURRENCY)
+        self._clients: dict[str, LaresBase] = {}
+        self._slots: dict[str, int] = {}
+
+    @staticmethod
+    def async_get(hass: HomeAssistant) -> "LaresManager":
+        """Return the manager of this Home Assistant instance."""
+        manager = hass.data.get(DATA_MANAGER)
+
+        if manager is None:
+            manager = hass.data[DATA_MANAGER] = LaresManager()
+
+        return manager
+
+    def create_client(self, entry_id: str, data: dict) -> LaresBase:
+        """Create the client of a config entry, using the shared resources."""
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=GLOBAL_CONNECTION_LIMIT,
+                limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                keepalive_timeout=CONNECTION_KEEPALIVE_TIMEOUT,
+            )
+
+        client = LaresBase(data, connector=self._connector, shared_queue=self._queue)
+        self._clients[entry_id] = client
+
+        # Take the first free slot, so a reloaded entry gets its slot back
+        if entry_id not in self._slots:
+            used = set(self._slots.values())
+            self._slots[entry_id] = next(
+                slot for slot in itertools.count() if slot not in used
+            )
+
+        return client
+
+    def slot(self, entry_id: str) -> int:
+        """Return the slot of a config entry."""
+        return self._slots[entry_id]
+
+    async def async_release(self, entry_id: str) -> None:
+        """Close the client of a config entry, and the pool after the last one."""
+        client = self._clients.pop(entry_id, None)
+
+        if client is not None:
+            await client.close()
+
+        self._slots.pop(entry_id, None)
+
+        if not self._clients and self._connector is not None:
+            _LOGGER.debug("Closing the shared connection pool")
+            await self._connector.close()
+            self._connector = None
@@ -0,0 +1,98 @@
+"""Parsers for the XML documents served by a Lares panel."""
+from functools import lru_cache
+
+from lxml import etree
+from lxml.etree import Element
+
+from .const import ZONE_BYPASS_ON
+from .snapshot import StatusSnapshot
+
+# A single parser instance is reused for every document
+_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
+_GENERAL_INFO_FIELDS = {
+    "name": "productName",
+    "info": "info1",
+    "version": "productHighRevision",
+    "revision": "productLowRevision",
+    "build": "productBuildRevision",
+}
+_GENERAL_INFO = {
+    key: etree.XPath(f"string(/generalInfo/{field})")
+    for key, field in _GENERAL_INFO_FIELDS.items()
+}
+_ZONES = etree.XPath("/zonesStatus/zone")
+_ZONES_STATUS = etree.XPath("/zonesStatus/zone/status/text()", smart_strings=False)
+_ZONES_BYPASS = etree.XPath("/zonesStatus/zone/bypass/text()", smart_strings=False)
+_PARTITIONS_STATUS = etree.XPath(
+    "/partitionsStatus/partition/text()", smart_strings=False
+)
+_SCENARIOS = etree.XPath("/scenariosOptions/scenario")
+_COMMAND = etree.XPath("string(/cmd)")
+
+
+def parse_document(xml: bytes) -> Element:
+    """Parse a full document tree."""
+    return etree.fromstring(xml, _PARSER)
+
+
+def parse_general_info(xml: bytes) -> dict:
+    """Parse the general info document."""
+    root = parse_document(xml)
+    return {key: str(xpath(root)) for key, xpath in _GENERAL_INFO.items()}
+
+
+def parse_zones_status(xml: bytes) -> StatusSnapshot:
+    """Parse the zones status."""
+    root = parse_document(xml)
+    statuses = _ZONES_STATUS(root)
+    bypasses = _ZONES_BYPASS(root)
+
+    # Empty elements have no text node, fall back to walking the zones
+    if len(statuses) != len(bypasses) or len(statuses) != len(root):
+        zones = _ZONES(root)
+        statuses = [zone.findtext("status") for zone in zones]
+        bypasses = [zone.findtext("bypass") for zone in zones]
+
+    return StatusSnapshot.from_values(
+        statuses, [bypass == ZONE_BYPASS_ON for bypass in bypasses]
+    )
+
+
+def parse_partitions_status(xml: bytes) -> StatusSnapshot:
+    """Parse the partitions status."""
+    root = parse_document(xml)
+    statuses = _PARTITIONS_STATUS(root)
+
+    if len(statuses) != len(root):
+        statuses = [partition.text or "" for partition in root]
+
+    return StatusSnapshot.from_values(statuses)
+
+
+def parse_scenarios(xml: bytes) -> list[dict]:
+    """Parse the scenario options."""
+    return [
+        {
+            "id": idx,
+            "enabled": scenario.findtext("abil") == "TRUE",
+            "noPin": scenario.findtext("nopin") == "TRUE",
+        }
+        for idx, scenario in enumerate(_SCENARIOS(parse_document(xml)))
+    ]
+
+
+def parse_descriptions(element: str, xml: bytes) -> list[str | None]:
+    """Parse the text of every element matching the given path."""
+    return [item.text for item in _xpath(element)(parse_document(xml))]
+
+
+def parse_command(xml: bytes) -> str:
+    """Parse the result of a command."""
+    return str(_COMMAND(parse_document(xml)))
+
+
+@lru_cache(maxsize=16)
+def _xpath(expression: str) -> etree.XPath:
+    """Return a compiled XPath expression."""
+    return etree.XPath(expression)
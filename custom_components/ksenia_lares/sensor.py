@@ -1,14 +1,23 @@
 """This component provides support for Lares partitions."""
-from datetime import timedelta
-
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
 )
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
 
 from .const import (
     DOMAIN,
@@ -20,12 +29,74 @@ from .const import (
     PARTITION_STATUS_PENDING,
     PARTITION_STATUS_ALARM,
     DATA_COORDINATOR,
+    DATA_DESCRIPTIONS,
+    DATA_DEVICE_INFO,
 )
+from .coordinator import LaresDataUpdateCoordinator
 
-SCAN_INTERVAL = timedelta(seconds=10)
 DEFAULT_DEVICE_CLASS = "motion"
 
 
+def _milliseconds(value: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if value is None else round(value * 1000, 1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class LaresDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a Lares diagnostic sensor."""
+
+    value_fn: Callable[[LaresDataUpdateCoordinator], StateType | datetime]
+
+
+DIAGNOSTIC_SENSORS = (
+    LaresDiagnosticSensorEntityDescription(
+        key="poll_latency_p50",
+        translation_key="poll_latency_p50",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda coordinator: _milliseconds(
+            coordinator.client.stats.poll_latency.percentile(50)
+        ),
+    ),
+    LaresDiagnosticSensorEntityDescription(
+        key="poll_latency_p95",
+        translation_key="poll_latency_p95",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda coordinator: _milliseconds(
+            coordinator.client.stats.poll_latency.percentile(95)
+        ),
+    ),
+    LaresDiagnosticSensorEntityDescription(
+        key="consecutive_failures",
+        translation_key="consecutive_failures",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.consecutive_failures,
+    ),
+    LaresDiagnosticSensorEntityDescription(
+        key="last_update",
+        translation_key="last_update",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda coordinator: coordinator.last_update_success_time,
+    ),
+    LaresDiagnosticSensorEntityDescription(
+        key="commands_sent",
+        translation_key="commands_sent",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.stats.commands_sent,
+    ),
+    LaresDiagnosticSensorEntityDescription(
+        key="commands_failed",
+        translation_key="commands_failed",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.stats.commands_failed,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -33,41 +104,45 @@ async def async_setup_entry(
 ) -> None:
     """Set up sensors attached to a Lares alarm device from a config entry."""
 
-    coordinator = hass.data[DOMAIN][config_entry.entry_id][DATA_COORDINATOR]
-    device_info = await coordinator.client.device_info()
-    partition_descriptions = await coordinator.client.partition_descriptions()
-
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_refresh()
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = entry_data[DATA_COORDINATOR]
+    device_info = entry_data[DATA_DEVICE_INFO]
+    partition_descriptions = entry_data[DATA_DESCRIPTIONS][DATA_PARTITIONS]
 
     async_add_entities(
         LaresSensor(coordinator, idx, partition_descriptions[idx], device_info)
-        for idx, zone in enumerate(coordinator.data[DATA_PARTITIONS])
+        for idx in range(len(coordinator.data[DATA_PARTITIONS]))
+    )
+    async_add_entities(
+        LaresDiagnosticSensor(coordinator, description, device_info)
+        for description in DIAGNOSTIC_SENSORS
     )
 
 
 class LaresSensor(CoordinatorEntity, SensorEntity):
     """An implementation of a Lares partition sensor."""
 
+    _attr_icon = "mdi:shield"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [
+        PARTITION_STATUS_DISARMED,
+        PARTITION_STATUS_ARMED,
+        PARTITION_STATUS_ARMED_IMMEDIATE,
+        PARTITION_STATUS_ARMING,
+        PARTITION_STATUS_PENDING,
+        PARTITION_STATUS_ALARM,
+    ]
+
     def __init__(self, coordinator, idx, description, device_info) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=(DATA_PARTITIONS, idx))
 
         self._coordinator = coordinator
         self._description = description
         self._idx = idx
 
-        self._attr_icon = "mdi:shield"
         self._attr_device_info = device_info
-        self._attr_device_class = SensorDeviceClass.ENUM
-        self._attr_options = [
-            PARTITION_STATUS_DISARMED,
-            PARTITION_STATUS_ARMED,
-            PARTITION_STATUS_ARMED_IMMEDIATE,
-            PARTITION_STATUS_ARMING,
-            PARTITION_STATUS_PENDING,
-            PARTITION_STATUS_ALARM,
-        ]
+        self.__update_state()
 
         # Hide sensor if it has no description
         is_inactive = not self._description
@@ -86,6 +161,59 @@ class LaresSensor(CoordinatorEntity, SensorEntity):
         return self._description
 
     @property
-    def native_value(self):
-        """Return the status of this partition."""
-        return self._coordinator.data[DATA_PARTITIONS][self._idx]["status"]
+    def available(self):
+        """Return True if entity is available."""
+        return self._attr_available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the partition status or availability changed."""
+        if self.__update_state():
+            self.async_write_ha_state()
+
+    def __update_state(self) -> bool:
+        """Derive the state from the partition status, return whether it changed."""
+        state = (
+            self._coordinator.data[DATA_PARTITIONS].status(self._idx),
+            self._coordinator.last_update_success,
+        )
+
+        if state == (self._attr_native_value, self._attr_available):
+            return False
+
+        self._attr_native_value, self._attr_available = state
+        return True
+
+
+class LaresDiagnosticSensor(SensorEntity):
+    """A sensor showing how the communication with the panel performs.
+
+    The statistics are kept in memory, so the sensor is polled rather than
+    updated with every coordinator update.
+    """
+
+    entity_description: LaresDiagnosticSensorEntityDescription
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: LaresDataUpdateCoordinator,
+        description: LaresDiagnosticSensorEntityDescription,
+        device_info: dict,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._coordinator = coordinator
+
+        # The panel id, as the name is the same for panels of the same model
+        _, panel_id = next(iter(device_info["identifiers"]))
+        self._attr_unique_id = f"lares_{description.key}_{panel_id}"
+        self._attr_device_info = device_info
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        """Return the value of the statistic."""
+        return self.entity_description.value_fn(self._coordinator)
@@ -0,0 +1,188 @@
+"""Services of the Ksenia Lares integration."""
+import asyncio
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    COMMAND_BURST_DELAYS,
+    CONF_PIN,
+    DATA_COORDINATOR,
+    DATA_PARTITIONS,
+    DATA_SCENARIOS,
+    DATA_ZONES,
+    DOMAIN,
+    RECENT_EVENTS_SIZE,
+    TRAFFIC_MAX_DURATION,
+)
+from .coordinator import LaresDataUpdateCoordinator
+from .traffic import LaresTrafficRecorder
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_BYPASS_ZONES = "bypass_zones"
+SERVICE_GET_RECENT_EVENTS = "get_recent_events"
+SERVICE_RECORD_TRAFFIC = "record_traffic"
+
+ATTR_BYPASS = "bypass"
+ATTR_CODE = "code"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_DURATION = "duration"
+ATTR_LIMIT = "limit"
+ATTR_ZONES = "zones"
+
+RECORD_TRAFFIC_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_DURATION, default=60): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=TRAFFIC_MAX_DURATION)
+        ),
+    }
+)
+
+BYPASS_ZONES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_ZONES): vol.All(
+            cv.ensure_list, [vol.All(vol.Coerce(int), vol.Range(min=0))]
+        ),
+        vol.Required(ATTR_BYPASS): cv.boolean,
+        vol.Optional(ATTR_CODE): cv.string,
+    }
+)
+
+GET_RECENT_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=RECENT_EVENTS_SIZE)
+        ),
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str) -> LaresDataUpdateCoordinator:
+    """Return the coordinator of a loaded config entry."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry_id)
+
+    if entry_data is None:
+        raise ServiceValidationError(f"Config entry {entry_id} is not loaded")
+
+    return entry_data[DATA_COORDINATOR]
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_bypass_zones(call: ServiceCall) -> ServiceResponse:
+        """Bypass or unbypass several zones, then confirm them with one poll."""
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        coordinator = _get_coordinator(hass, entry_id)
+        zones = list(dict.fromkeys(call.data[ATTR_ZONES]))
+        bypass = call.data[ATTR_BYPASS]
+        code = call.data.get(ATTR_CODE) or coordinator.config_entry.options.get(CONF_PIN)
+
+        if code is None:
+            raise ServiceValidationError("Pin needed for bypass zones")
+
+        zone_count = len(coordinator.data[DATA_ZONES])
+
+        if invalid := [zone for zone in zones if zone >= zone_count]:
+            raise ServiceValidationError(f"Unknown zones {invalid}")
+
+        # Raises PanelUnavailable when none of the commands could be sent
+        sent = await coordinator.client.bypass_zones(zones, code, bypass)
+
+        # Give the panel a moment to apply the commands, then poll once
+        await asyncio.sleep(COMMAND_BURST_DELAYS[0])
+        snapshot = await coordinator.async_refresh_resource(DATA_ZONES)
+
+        return {
+            "zones": [
+                {
+                    "zone": zone,
+                    "sent": sent[zone],
+                    "confirmed": None
+                    if snapshot is None
+                    else snapshot.is_bypassed(zone) == bypass,
+                }
+                for zone in zones
+            ]
+        }
+
+    async def async_get_recent_events(call: ServiceCall) -> ServiceResponse:
+        """Return the latest zone and partition transitions of a panel."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+
+        return {"events": coordinator.recent_events(call.data.get(ATTR_LIMIT))}
+
+    async def async_record_traffic(call: ServiceCall) -> ServiceResponse:
+        """Record the traffic with a panel to a file, for the given duration."""
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        client = _get_coordinator(hass, entry_id).client
+
+        if client.recorder is not None:
+            raise ServiceValidationError(f"Already recording traffic of {entry_id}")
+
+        started = dt_util.utcnow()
+        filename = hass.config.path(
+            f"{DOMAIN}_{entry_id}_{started.strftime('%Y%m%d%H%M%S')}.jsonl.gz"
+        )
+        recorder = client.recorder = LaresTrafficRecorder()
+
+        async def async_save(_now) -> None:
+            """Stop recording and write the file."""
+            client.recorder = None
+            # Descriptions are polled rarely, keep them to replay the recording
+            info = {
+                **(await client.info() or {}),
+                "model": await client.get_model(),
+                "started": started.isoformat(),
+                "descriptions": {
+                    DATA_ZONES: await client.zone_descriptions(),
+                    DATA_PARTITIONS: await client.partition_descriptions(),
+                    DATA_SCENARIOS: await client.scenario_descriptions(),
+                },
+            }
+            info.pop("mac", None)
+            info.pop("id", None)
+
+            await hass.async_add_executor_job(recorder.save, filename, info)
+            _LOGGER.info("Recorded %s requests to %s", len(recorder), filename)
+
+        async_call_later(hass, call.data[ATTR_DURATION], async_save)
+
+        return {"filename": filename}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BYPASS_ZONES,
+        async_bypass_zones,
+        schema=BYPASS_ZONES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_RECENT_EVENTS,
+        async_get_recent_events,
+        schema=GET_RECENT_EVENTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD_TRAFFIC,
+        async_record_traffic,
+        schema=RECORD_TRAFFIC_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,104 @@
+"""Compact status snapshots of Lares zones and partitions."""
+from collections.abc import Iterable
+
+# Status strings are interned to a single byte code, shared by all snapshots
+_CODES: dict[str, int] = {}
+_STATUSES: list[str] = []
+
+
+def status_code(status: str) -> int:
+    """Return the byte code of a status string, interning it when new."""
+    code = _CODES.get(status)
+
+    if code is None:
+        code = len(_STATUSES)
+
+        if code > 0xFF:
+            raise ValueError(f"Too many distinct statuses to intern {status}")
+
+        _CODES[status] = code
+        _STATUSES.append(status)
+
+    return code
+
+
+class StatusSnapshot:
+    """Immutable status of all zones or partitions, one byte per index."""
+
+    __slots__ = ("_status", "_bypass")
+
+    def __init__(self, status: bytes, bypass: bytes = b"") -> None:
+        """Initialize from status codes and optional bypass flags."""
+        self._status = status
+        self._bypass = bypass
+
+    @classmethod
+    def from_values(
+        cls, statuses: Iterable[str], bypassed: Iterable[bool] | None = None
+    ) -> "StatusSnapshot":
+        """Create a snapshot from status strings and bypass flags."""
+        values = list(statuses)
+
+        try:
+            status = bytes(map(_CODES.__getitem__, values))
+        except KeyError:
+            status = bytes(map(status_code, values))
+
+        bypass = b"" if bypassed is None else bytes(bypassed)
+
+        return cls(status, bypass)
+
+    def __len__(self) -> int:
+        return len(self._status)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, StatusSnapshot):
+            return NotImplemented
+
+        return self._status == other._status and self._bypass == other._bypass
+
+    def __hash__(self) -> int:
+        return hash((self._status, self._bypass))
+
+    def __repr__(self) -> str:
+        return f"StatusSnapshot({self.statuses()!r})"
+
+    def status(self, idx: int) -> str:
+        """Return the status of the given index."""
+        return _STATUSES[self._status[idx]]
+
+    def is_bypassed(self, idx: int) -> bool:
+        """Return if the given index is bypassed."""
+        return bool(self._bypass) and self._bypass[idx] == 1
+
+    def statuses(self) -> list[str]:
+        """Return the status of every index."""
+        return [_STATUSES[code] for code in self._status]
+
+    def has_status(self, statuses: Iterable[str]) -> bool:
+        """Return if any index has one of the given statuses."""
+        codes = {_CODES[status] for status in statuses if status in _CODES}
+        return any(code in codes for code in self._status)
+
+    def diff(self, other: "StatusSnapshot") -> list[int] | None:
+        """Return the indexes that differ, None when the sizes differ."""
+        if len(self._status) != len(other._status) or len(self._bypass) != len(
+            other._bypass
+        ):
+            return None
+
+        if self == other:
+            return []
+
+        changed = {
+            idx
+            for idx, (old, new) in enumerate(zip(self._status, other._status))
+            if old != new
+        }
+        changed.update(
+            idx
+            for idx, (old, new) in enumerate(zip(self._bypass, other._bypass))
+            if old != new
+        )
+
+        return sorted(changed)
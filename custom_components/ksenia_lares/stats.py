@@ -0,0 +1,110 @@
+"""Request and command statistics of a Lares panel."""
+from collections import deque
+
+from .const import STATS_WINDOW
+
+
+class RollingHistogram:
+    """Distribution of the latest samples of a measurement."""
+
+    __slots__ = ("_samples",)
+
+    def __init__(self, size: int = STATS_WINDOW) -> None:
+        """Initialize."""
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, value: float) -> None:
+        """Add a sample, dropping the oldest when full."""
+        self._samples.append(value)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return the nearest-rank percentile of the samples, None when empty."""
+        if not self._samples:
+            return None
+
+        ordered = sorted(self._samples)
+        rank = max(0, round(percentile / 100 * len(ordered)) - 1)
+
+        return ordered[min(rank, len(ordered) - 1)]
+
+    def as_dict(self) -> dict:
+        """Return a summary of the samples."""
+        return {
+            "count": len(self._samples),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": max(self._samples, default=None),
+        }
+
+
+class EndpointStats:
+    """Counters and timings of the requests to a single endpoint."""
+
+    __slots__ = (
+        "requests",
+        "errors",
+        "timeouts",
+        "not_modified",
+        "unchanged",
+        "latency",
+        "parse_time",
+    )
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self.latency = RollingHistogram()
+        self.parse_time = RollingHistogram()
+
+    def as_dict(self) -> dict:
+        """Return the statistics as a dict."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "latency": self.latency.as_dict(),
+            "parse_time": self.parse_time.as_dict(),
+        }
+
+
+class LaresStats:
+    """Statistics of every endpoint and command of a panel, times in seconds."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.poll_latency = RollingHistogram()
+        self.queue_wait = RollingHistogram()
+        self.commands_sent = 0
+        self.commands_failed = 0
+
+    def endpoint(self, path: str) -> EndpointStats:
+        """Return the statistics of an endpoint, the query string is left out."""
+        endpoint = path.split("?", 1)[0]
+        stats = self.endpoints.get(endpoint)
+
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+
+        return stats
+
+    def as_dict(self) -> dict:
+        """Return the statistics as a dict."""
+        return {
+            "poll_latency": self.poll_latency.as_dict(),
+            "queue_wait": self.queue_wait.as_dict(),
+            "commands_sent": self.commands_sent,
+            "commands_failed": self.commands_failed,
+            "endpoints": {
+                endpoint: stats.as_dict() for endpoint, stats in self.endpoints.items()
+            },
+        }
@@ -0,0 +1,66 @@
+"""Persistent storage of Ksenia Lares descriptions."""
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .base import LaresBase
+from .const import DOMAIN, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LaresDescriptionStore:
+    """Keep zone, partition and scenario descriptions across restarts."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, client: LaresBase) -> None:
+        """Initialize."""
+        self._store = self._create_store(hass, entry_id)
+        self._client = client
+        self._descriptions: dict | None = None
+
+    @staticmethod
+    def _create_store(hass: HomeAssistant, entry_id: str) -> Store:
+        """Create the storage helper for a config entry."""
+        return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+    @classmethod
+    async def async_remove(cls, hass: HomeAssistant, entry_id: str) -> None:
+        """Remove the stored descriptions of a config entry."""
+        await cls._create_store(hass, entry_id).async_remove()
+
+    @property
+    def loaded(self) -> bool:
+        """Return if descriptions were loaded from disk."""
+        return self._descriptions is not None
+
+    async def async_load(self) -> dict | None:
+        """Load the descriptions, if stored for this panel and firmware build."""
+        info = await self._client.info()
+        stored = await self._store.async_load()
+
+        if info is None or stored is None:
+            return None
+
+        if stored.get("id") != info["id"] or stored.get("build") != info["build"]:
+            _LOGGER.debug("Ignoring stored descriptions of another panel or firmware")
+            return None
+
+        self._descriptions = stored["descriptions"]
+        return self._descriptions
+
+    async def async_save(self, descriptions: dict) -> None:
+        """Save the descriptions when they changed."""
+        info = await self._client.info()
+
+        if info is None or descriptions == self._descriptions:
+            return
+
+        await self._store.async_save(
+            {
+                "id": info["id"],
+                "build": info["build"],
+                "descriptions": descriptions,
+            }
+        )
+        self._descriptions = descriptions
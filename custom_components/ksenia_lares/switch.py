@@ -1,6 +1,5 @@
 """This component provides support for Lares zone bypass."""
 import logging
-from datetime import timedelta
 
 from homeassistant.components.switch import SwitchDeviceClass, SwitchEntity
 from homeassistant.helpers.update_coordinator import (
@@ -8,21 +7,23 @@ from homeassistant.helpers.update_coordinator import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 
 from .coordinator import LaresDataUpdateCoordinator
 from .const import (
     DOMAIN,
     DATA_ZONES,
-    ZONE_BYPASS_ON,
     ZONE_STATUS_NOT_USED,
     DATA_COORDINATOR,
+    DATA_DESCRIPTIONS,
+    DATA_DEVICE_INFO,
     CONF_PIN,
+    OPTIMISTIC_TIMEOUT,
 )
 
 _LOGGER = logging.getLogger(__name__)
-SCAN_INTERVAL = timedelta(seconds=10)
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -31,17 +32,15 @@ async def async_setup_entry(
 ) -> None:
     """Set up zone bypass switches for zones in the Lares alarm device from a config entry."""
 
-    coordinator = hass.data[DOMAIN][config_entry.entry_id][DATA_COORDINATOR]
-    device_info = await coordinator.client.device_info()
-    zone_descriptions = await coordinator.client.zone_descriptions()
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = entry_data[DATA_COORDINATOR]
+    device_info = entry_data[DATA_DEVICE_INFO]
+    zone_descriptions = entry_data[DATA_DESCRIPTIONS][DATA_ZONES]
     options = { CONF_PIN: config_entry.options.get(CONF_PIN)}
 
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_refresh()
-
     async_add_entities(
         LaresBypassSwitch(coordinator, idx, zone_descriptions[idx], device_info, options)
-        for idx, zone in enumerate(coordinator.data[DATA_ZONES])
+        for idx in range(len(coordinator.data[DATA_ZONES]))
     )
 
 
@@ -55,7 +54,7 @@ class LaresBypassSwitch(CoordinatorEntity, SwitchEntity):
 
     def __init__(self, coordinator: LaresDataUpdateCoordinator, idx: int, description: str, device_info: dict, options: dict) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=(DATA_ZONES, idx))
 
         self._coordinator = coordinator
         self._idx = idx
@@ -66,17 +65,80 @@ class LaresBypassSwitch(CoordinatorEntity, SwitchEntity):
         self._attr_name = description
 
         is_used = (
-            self._coordinator.data[DATA_ZONES][self._idx]["status"] != ZONE_STATUS_NOT_USED
+            self._coordinator.data[DATA_ZONES].status(self._idx) != ZONE_STATUS_NOT_USED
         )
+        self._reported: bool | None = None
+        self.__update_reported()
 
         self._attr_entity_registry_enabled_default = is_used
         self._attr_entity_registry_visible_default = is_used
 
+        # Optimistic state after a command, until the panel reports it
+        self._optimistic: bool | None = None
+        self._optimistic_since = 0.0
+        self._unsub_rollback: CALLBACK_TYPE | None = None
+
     @property
     def is_on(self) -> bool | None:
         """Return true if the zone is bypassed."""
-        status = self._coordinator.data[DATA_ZONES][self._idx]["bypass"]
-        return status == ZONE_BYPASS_ON
+        if self._optimistic is not None:
+            return self._optimistic
+
+        return self._reported
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return self._attr_available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Confirm the optimistic state, write the state only when it changed."""
+        changed = self.__update_reported()
+
+        if self._optimistic is not None and self._reported == self._optimistic:
+            elapsed = self.hass.loop.time() - self._optimistic_since
+            _LOGGER.debug("Bypass of zone %s confirmed after %.2fs", self._idx, elapsed)
+            self.__clear_optimistic()
+            changed = True
+
+        if changed:
+            self.async_write_ha_state()
+
+    def __update_reported(self) -> bool:
+        """Derive the bypass state reported by the panel, return whether it changed."""
+        state = (
+            self._coordinator.data[DATA_ZONES].is_bypassed(self._idx),
+            self._coordinator.last_update_success,
+        )
+
+        if state == (self._reported, self._attr_available):
+            return False
+
+        self._reported, self._attr_available = state
+        return True
+
+    @callback
+    def __rollback(self, _now) -> None:
+        """Roll back the optimistic state, the panel did not confirm it."""
+        _LOGGER.warning("Bypass of zone %s not confirmed, rolling back", self._idx)
+        self._unsub_rollback = None
+        self.__clear_optimistic()
+        self.async_write_ha_state()
+
+    @callback
+    def __clear_optimistic(self) -> None:
+        """Clear the optimistic state and its rollback timer."""
+        self._optimistic = None
+
+        if self._unsub_rollback is not None:
+            self._unsub_rollback()
+            self._unsub_rollback = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending rollback."""
+        self.__clear_optimistic()
+        await super().async_will_remove_from_hass()
 
     async def async_turn_on(self, **kwargs):
         """Bypass the zone."""
@@ -84,7 +146,7 @@ class LaresBypassSwitch(CoordinatorEntity, SwitchEntity):
             _LOGGER.error("Pin needed for bypass zone")
             return
 
-        await self._coordinator.client.bypass_zone(self._idx, self._pin, True)
+        await self.__command(True)
 
     async def async_turn_off(self, **kwargs):
         """Unbypass the zone."""
@@ -92,4 +154,23 @@ class LaresBypassSwitch(CoordinatorEntity, SwitchEntity):
             _LOGGER.error("Pin needed for unbypass zone")
             return
 
-        await self._coordinator.client.bypass_zone(self._idx, self._pin, False)
\ No newline at end of file
+        await self.__command(False)
+
+    async def __command(self, bypass: bool) -> None:
+        """Send the bypass command and show the new state optimistically."""
+        if not await self._coordinator.client.bypass_zone(self._idx, self._pin, bypass):
+            return
+
+        self.__clear_optimistic()
+
+        # A zone already in the requested state will not report a change
+        if self._reported != bypass:
+            self._optimistic = bypass
+            self._optimistic_since = self.hass.loop.time()
+            self._unsub_rollback = async_call_later(
+                self.hass, OPTIMISTIC_TIMEOUT, self.__rollback
+            )
+
+        self.async_write_ha_state()
+
+        self._coordinator.async_request_burst(DATA_ZONES)
@@ -0,0 +1,114 @@
+"""Recording and replay of the traffic between the client and a Lares panel."""
+import asyncio
+from collections import deque
+from collections.abc import Mapping
+import gzip
+import json
+import re
+import time
+
+import aiohttp
+
+from .const import TRAFFIC_FORMAT_VERSION, TRAFFIC_MAX_ENTRIES
+
+_PIN = re.compile(r"(?<=[?&]pin=)[^&'\"\s]*")
+
+# Bodies are stored as latin-1 text, which maps every byte to a character
+_BODY_ENCODING = "latin-1"
+
+
+def redact_path(path: str) -> str:
+    """Return the path, or any text holding a command URL, with the PIN replaced."""
+    return _PIN.sub("REDACTED", path)
+
+
+class LaresTrafficRecorder:
+    """Keep the requests sent to a panel and their responses in memory."""
+
+    def __init__(self, max_entries: int = TRAFFIC_MAX_ENTRIES) -> None:
+        """Initialize."""
+        self._start = time.monotonic()
+        self._entries: deque[dict] = deque(maxlen=max_entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(
+        self,
+        path: str,
+        latency: float,
+        status: int | None = None,
+        body: bytes | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Record a response, or the error of a failed request."""
+        entry = {
+            "t": round(time.monotonic() - self._start - latency, 4),
+            "path": redact_path(path),
+            "latency": round(latency, 4),
+        }
+
+        if error is not None:
+            entry["error"] = error
+        else:
+            entry["status"] = status
+            entry["body"] = body.decode(_BODY_ENCODING)
+
+        self._entries.append(entry)
+
+    def save(self, filename: str, info: Mapping | None = None) -> None:
+        """Write the recording as gzipped JSON lines, this blocks on file I/O."""
+        header = {"version": TRAFFIC_FORMAT_VERSION, "info": dict(info or {})}
+
+        with gzip.open(filename, "wt", encoding="utf-8") as file:
+            for entry in (header, *self._entries):
+                file.write(json.dumps(entry, separators=(",", ":")))
+                file.write("\n")
+
+
+def load_recording(filename: str) -> tuple[dict, list[dict]]:
+    """Read the header and entries of a recording, this blocks on file I/O."""
+    with gzip.open(filename, "rt", encoding="utf-8") as file:
+        header, *entries = (json.loads(line) for line in file)
+
+    if header.get("version") != TRAFFIC_FORMAT_VERSION:
+        raise ValueError(f"Unsupported recording version {header.get('version')}")
+
+    return header, entries
+
+
+class LaresReplayTransport:
+    """Answer the requests of a client with the responses of a recording.
+
+    The responses of each path are returned in the recorded order, after the
+    recorded latency divided by the speed. The last response of a path is
+    repeated once its recording is exhausted.
+    """
+
+    def __init__(self, entries: list[dict], speed: float = 1.0) -> None:
+        """Initialize."""
+        self._speed = speed
+        self._responses: dict[str, deque[dict]] = {}
+
+        for entry in entries:
+            self._responses.setdefault(entry["path"], deque()).append(entry)
+
+    async def __call__(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> tuple[int, Mapping[str, str], bytes]:
+        """Return the next recorded response of the requested path."""
+        path = redact_path(url.split("/xml/", 1)[-1])
+        responses = self._responses.get(path)
+
+        if not responses:
+            raise aiohttp.ClientConnectionError(f"No recorded response for {path}")
+
+        entry = responses.popleft() if len(responses) > 1 else responses[0]
+
+        if self._speed > 0:
+            await asyncio.sleep(entry["latency"] / self._speed)
+
+        if "error" in entry:
+            raise aiohttp.ClientConnectionError(entry["error"])
+
+        return entry["status"], {}, entry["body"].encode(_BODY_ENCODING)
@@ -0,0 +1,461 @@
+"""Benchmarks of the Ksenia Lares hot paths against the panel simulator.
+
+Measures a request with a session per request against the pooled session of
+the client, a single client round-trip, the parsing of every XML document, a
+full coordinator update cycle, the fan-out of one update to the zone and
+partition entities and the latency of commands sent while every document is
+polled, for the 16IP, 48IP and 128IP models. The requests of a cold start
+are counted as well.
+
+    python tools/benchmark.py --save tools/benchmark_baseline.json
+    python tools/benchmark.py --compare tools/benchmark_baseline.json
+
+When comparing, benchmarks slower than the baseline by more than the
+threshold are reported and the exit code is 1.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+import logging
+import os
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.ksenia_lares import parser  # noqa: E402
+from custom_components.ksenia_lares.base import LaresBase  # noqa: E402
+from custom_components.ksenia_lares.binary_sensor import LaresBinarySensor  # noqa: E402
+from custom_components.ksenia_lares.const import (  # noqa: E402
+    CONF_PIN,
+    DATA_DESCRIPTIONS,
+    DATA_PARTITIONS,
+    DATA_ZONES,
+)
+from custom_components.ksenia_lares.coordinator import (  # noqa: E402
+    LaresDataUpdateCoordinator,
+)
+from custom_components.ksenia_lares.sensor import LaresSensor  # noqa: E402
+from custom_components.ksenia_lares.snapshot import StatusSnapshot  # noqa: E402
+from custom_components.ksenia_lares.store import LaresDescriptionStore  # noqa: E402
+from custom_components.ksenia_lares.switch import LaresBypassSwitch  # noqa: E402
+from lares_simulator import MODELS, LaresSimulator, SimulatorConfig  # noqa: E402
+
+ROUNDS = 7
+DEFAULT_THRESHOLD = 0.2
+
+# Commands sent, and the latency of the simulated panel, for the command latency
+COMMANDS = 40
+COMMAND_PANEL_LATENCY = 0.05
+
+PARSERS = {
+    "zonesStatus": ("zones/zonesStatus{model}.xml", parser.parse_zones_status),
+    "partitionsStatus": (
+        "partitions/partitionsStatus{model}.xml",
+        parser.parse_partitions_status,
+    ),
+    "scenariosOptions": ("scenarios/scenariosOptions.xml", parser.parse_scenarios),
+    "zonesDescription": (
+        "zones/zonesDescription{model}.xml",
+        lambda xml: parser.parse_descriptions("/zonesDescription/zone", xml),
+    ),
+    "generalInfo": ("info/generalInfo.xml", parser.parse_general_info),
+}
+
+
+def measure(func: Callable[[], object], number: int) -> float:
+    """Return the median time of one call in microseconds."""
+    timings = []
+
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+
+        for _ in range(number):
+            func()
+
+        timings.append((time.perf_counter() - start) / number)
+
+    return statistics.median(timings) * 1e6
+
+
+async def measure_async(func: Callable[[], Awaitable[object]], number: int) -> float:
+    """Return the median time of one awaited call in microseconds."""
+    timings = []
+
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+
+        for _ in range(number):
+            await func()
+
+        timings.append((time.perf_counter() - start) / number)
+
+    return statistics.median(timings) * 1e6
+
+
+async def benchmark_model(hass: HomeAssistant, model: str, number: int) -> dict[str, float]:
+    """Run every benchmark against a simulated panel of the given model."""
+    results = {}
+    simulator = LaresSimulator(SimulatorConfig(model=model))
+    port = await simulator.start()
+    config = simulator.config
+    client = LaresBase(
+        {
+            "host": "127.0.0.1",
+            "port": port,
+            "username": config.username,
+            "password": config.password,
+            "mac": "00:00:00:00:00:00",
+        }
+    )
+
+    try:
+        auth = aiohttp.BasicAuth(config.username, config.password)
+
+        # Reading the zones status with a new session and connection for every
+        # request, against the pooled keep-alive session of the client
+        url = f"http://127.0.0.1:{port}/xml/zones/zonesStatus{model}.xml"
+
+        async def session_per_request() -> None:
+            async with aiohttp.ClientSession(auth=auth) as session:
+                async with session.get(url) as response:
+                    await response.read()
+
+        results["session.per_request"] = await measure_async(
+            session_per_request, max(number // 10, 1)
+        )
+        results["session.pooled"] = await measure_async(
+            lambda: client._read_now(url, None), max(number // 10, 1)
+        )
+
+        # Parsing of each document, as served by the panel
+        async with aiohttp.ClientSession(auth=auth) as session:
+            for name, (path, parse) in PARSERS.items():
+                url = f"http://127.0.0.1:{port}/xml/{path.format(model=model)}"
+
+                async with session.get(url) as response:
+                    xml = await response.read()
+
+                results[f"parse.{name}"] = measure(lambda: parse(xml), number)
+
+        # Round-trip of the zones status, changing a zone every time so the
+        # response is parsed rather than recognized as unchanged
+        zone = 0
+
+        async def zones() -> None:
+            nonlocal zone
+            zone = (zone + 1) % len(simulator.zones)
+            simulator.set_zone(zone, bypass=zone % 2 == 0)
+            await client.zones()
+
+        results["client.zones"] = await measure_async(zones, max(number // 10, 1))
+        results["client.zones_unchanged"] = await measure_async(
+            client.zones, max(number // 10, 1)
+        )
+
+        # Update cycle of the zones and partitions, as due on most ticks
+        store = LaresDescriptionStore(hass, f"benchmark_{model}", client)
+        coordinator = LaresDataUpdateCoordinator(hass, client, {}, store)
+        coordinator.data = await coordinator._async_update_data()
+
+        async def update_cycle() -> None:
+            await zones()
+            coordinator._last_poll[DATA_ZONES] = float("-inf")
+            coordinator._last_poll[DATA_PARTITIONS] = float("-inf")
+            coordinator.data = await coordinator._async_update_data()
+
+        results["coordinator.update_cycle"] = await measure_async(
+            update_cycle, max(number // 10, 1)
+        )
+
+        results.update(await benchmark_fan_out(hass, coordinator, number))
+        await coordinator.async_shutdown()
+    finally:
+        await client.close()
+        await simulator.stop()
+
+    return results
+
+
+async def benchmark_commands(model: str) -> dict[str, float]:
+    """Measure the latency of bypass commands while every document is polled."""
+    simulator = LaresSimulator(
+        SimulatorConfig(model=model, latency=COMMAND_PANEL_LATENCY)
+    )
+    port = await simulator.start()
+    config = simulator.config
+    client = LaresBase(
+        {
+            "host": "127.0.0.1",
+            "port": port,
+            "username": config.username,
+            "password": config.password,
+            "mac": "00:00:00:00:00:00",
+        }
+    )
+
+    done = asyncio.Event()
+
+    async def poll(path: str, parse: Callable[[bytes], object]) -> None:
+        while not done.is_set():
+            await client.get(path, parser=parse)
+
+    try:
+        await client.get_model()
+        pollers = [
+            asyncio.create_task(poll(path.format(model=model), parse))
+            for path, parse in PARSERS.values()
+        ]
+        latencies = []
+
+        for idx in range(COMMANDS):
+            start = time.perf_counter()
+            await client.bypass_zone(0, config.pin, idx % 2 == 0)
+            latencies.append(time.perf_counter() - start)
+
+        # Let the pollers finish their requests rather than cancelling them,
+        # a cancelled poll leaves its request running
+        done.set()
+        await asyncio.gather(*pollers)
+    finally:
+        await client.close()
+        await simulator.stop()
+
+    latencies.sort()
+
+    return {
+        "command.latency_p50": statistics.median(latencies) * 1e6,
+        "command.latency_p95": latencies[int(len(latencies) * 0.95)] * 1e6,
+    }
+
+
+async def count_startup_requests(hass: HomeAssistant, model: str) -> dict[str, int]:
+    """Count the requests of a cold start, without stored descriptions.
+
+    Either every platform fetches the device info and its descriptions and
+    refreshes the coordinator itself, or the platforms share the first
+    refresh of the config entry setup.
+    """
+    counts = {}
+    simulator = LaresSimulator(SimulatorConfig(model=model))
+    port = await simulator.start()
+    config = simulator.config
+
+    try:
+        for mode in ("per_platform", "shared"):
+            client = LaresBase(
+                {
+                    "host": "127.0.0.1",
+                    "port": port,
+                    "username": config.username,
+                    "password": config.password,
+                    "mac": "00:00:00:00:00:00",
+                }
+            )
+            store = LaresDescriptionStore(hass, f"startup_{model}_{mode}", client)
+            coordinator = LaresDataUpdateCoordinator(hass, client, {}, store)
+            simulator.requests.clear()
+
+            async def platform(*descriptions: Callable[[], Awaitable[object]]) -> None:
+                await client.device_info()
+
+                for fetch in descriptions:
+                    await fetch()
+
+                await coordinator.async_refresh()
+
+            await client.device_info()
+            await client.info()
+
+            if mode == "per_platform":
+                await asyncio.gather(
+                    platform(client.zone_descriptions),
+                    platform(client.partition_descriptions),
+                    platform(client.zone_descriptions),
+                    platform(
+                        client.partition_descriptions, client.scenario_descriptions
+                    ),
+                )
+            else:
+                await coordinator.async_refresh()
+
+            counts[mode] = sum(simulator.requests.values())
+            await coordinator.async_shutdown()
+            await client.close()
+    finally:
+        await simulator.stop()
+
+    return counts
+
+
+async def create_entities(
+    hass: HomeAssistant, coordinator: LaresDataUpdateCoordinator
+) -> list:
+    """Create the zone and partition entities, listening to the coordinator."""
+    data = coordinator.data
+    descriptions = data[DATA_DESCRIPTIONS]
+    device_info = await coordinator.client.device_info()
+    zone_count = len(data[DATA_ZONES])
+    entities = []
+
+    for idx in range(zone_count):
+        entities.append(
+            LaresBinarySensor(
+                coordinator, idx, descriptions[DATA_ZONES][idx], device_info
+            )
+        )
+        entities.append(
+            LaresBypassSwitch(
+                coordinator,
+                idx,
+                descriptions[DATA_ZONES][idx],
+                device_info,
+                {CONF_PIN: None},
+            )
+        )
+
+    for idx in range(len(data[DATA_PARTITIONS])):
+        entities.append(
+            LaresSensor(
+                coordinator, idx, descriptions[DATA_PARTITIONS][idx], device_info
+            )
+        )
+
+    for idx, entity in enumerate(entities):
+        entity.hass = hass
+        entity.entity_id = f"{entity.__module__.rsplit('.', 1)[-1]}.lares_{idx}"
+        await entity.async_added_to_hass()
+
+    return entities
+
+
+async def benchmark_fan_out(
+    hass: HomeAssistant, coordinator: LaresDataUpdateCoordinator, number: int
+) -> dict[str, float]:
+    """Measure notifying the entities of changed zones."""
+    data = coordinator.data
+    zone_count = len(data[DATA_ZONES])
+    entities = await create_entities(hass, coordinator)
+
+    # Alternate between two snapshots, with either one or every zone changed
+    statuses = data[DATA_ZONES].statuses()
+    normal = StatusSnapshot.from_values(statuses, [False] * zone_count)
+    single = StatusSnapshot.from_values(["ALARM"] + statuses[1:], [False] * zone_count)
+    every = StatusSnapshot.from_values(["ALARM"] * zone_count, [False] * zone_count)
+    results = {}
+
+    for name, changed in (("one_zone", single), ("every_zone", every)):
+        snapshots = [changed, normal]
+
+        def update() -> None:
+            previous = coordinator.data
+            new = {**previous, DATA_ZONES: snapshots[0]}
+            snapshots.reverse()
+            coordinator._changed = coordinator._diff(previous, new)
+            coordinator.data = new
+            coordinator.async_update_listeners()
+
+        results[f"fan_out.{name}"] = measure(update, max(number // 10, 1))
+
+    for entity in entities:
+        await entity.async_will_remove_from_hass()
+
+    return results
+
+
+async def run(
+    models: list[str], number: int
+) -> tuple[dict[str, float], dict[str, int]]:
+    """Run the benchmarks of every model, and count their startup requests."""
+    results = {}
+    requests = {}
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+
+        try:
+            for model in models:
+                for name, value in (await benchmark_model(hass, model, number)).items():
+                    results[f"{model}.{name}"] = value
+
+                for name, value in (await benchmark_commands(model)).items():
+                    results[f"{model}.{name}"] = value
+
+                for mode, count in (await count_startup_requests(hass, model)).items():
+                    requests[f"{model}.startup_requests.{mode}"] = count
+        finally:
+            await hass.async_stop(force=True)
+
+    return results, requests
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> bool:
+    """Print the change against the baseline, return if nothing regressed."""
+    regressed = False
+
+    for name, value in results.items():
+        reference = baseline.get(name)
+
+        if reference is None:
+            print(f"{name:45} {value:10.1f}µs  (no baseline)")
+            continue
+
+        change = value / reference - 1
+        flag = ""
+
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+
+        print(f"{name:45} {value:10.1f}µs  {change:+7.1%}{flag}")
+
+    return not regressed
+
+
+def main() -> None:
+    """Run the benchmarks from the command line."""
+    parser_ = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser_.add_argument("--model", choices=MODELS, action="append")
+    parser_.add_argument("--number", type=int, default=1000, help="calls per round")
+    parser_.add_argument("--save", help="save the results as baseline to this file")
+    parser_.add_argument("--compare", help="compare to the baseline in this file")
+    parser_.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser_.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    # Entities are added without a platform, which Home Assistant warns about
+    logging.getLogger("homeassistant.helpers.entity").setLevel(logging.ERROR)
+
+    results, requests = asyncio.run(run(args.model or list(MODELS), args.number))
+    success = True
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            success = compare(results, json.load(file), args.threshold)
+    else:
+        for name, value in results.items():
+            print(f"{name:45} {value:10.1f}µs")
+
+    for name, count in requests.items():
+        print(f"{name:45} {count:10d}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({name: round(value, 1) for name, value in results.items()}, file, indent=2)
+            file.write(os.linesep)
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+"""Simulator of the Ksenia Lares web interface, for load testing and benchmarks.
+
+Serves the XML documents used by the integration with BasicAuth, and accepts
+the scenario and zone bypass commands. Latency, jitter, a connection limit,
+error injection and scripted zone/partition transitions are configurable.
+
+    python tools/lares_simulator.py --model 128IP --latency 0.05 --port 4202
+
+Transitions are read from a JSON file with a list of events, relative to the
+start of the simulator:
+
+    [
+        {"at": 5, "zone": 3, "status": "ALARM"},
+        {"at": 8, "zone": 3, "status": "NORMAL"},
+        {"at": 10, "partition": 0, "status": "EXIT"}
+    ]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import hashlib
+import json
+import logging
+import random
+from xml.sax.saxutils import escape
+
+from aiohttp import BasicAuth, hdrs, web
+
+_LOGGER = logging.getLogger(__name__)
+
+MODELS = {
+    "16IP": {"zones": 16, "partitions": 4},
+    "48IP": {"zones": 48, "partitions": 8},
+    "128IP": {"zones": 128, "partitions": 16},
+}
+SCENARIOS = 16
+EXIT_DELAY = 5.0
+
+
+@dataclass
+class SimulatorConfig:
+    """Configuration of a simulated panel."""
+
+    model: str = "48IP"
+    username: str = "admin"
+    password: str = "admin"
+    pin: str = "123456"
+    latency: float = 0.0
+    jitter: float = 0.0
+    max_connections: int = 0
+    error_rate: float = 0.0
+    drop_rate: float = 0.0
+    etag: bool = False
+    transitions: list[dict] = field(default_factory=list)
+    seed: int | None = None
+
+
+class LaresSimulator:
+    """A simulated Lares panel served over HTTP."""
+
+    def __init__(self, config: SimulatorConfig | None = None) -> None:
+        """Initialize."""
+        self.config = config or SimulatorConfig()
+        self.requests: dict[str, int] = {}
+
+        size = MODELS[self.config.model]
+        self.zones = [
+            {"status": "NORMAL", "bypass": "UN_BYPASS"} for _ in range(size["zones"])
+        ]
+        self.partitions = ["DISARMED"] * size["partitions"]
+
+        self._random = random.Random(self.config.seed)
+        self._auth = BasicAuth(self.config.username, self.config.password)
+        self._active = 0
+        self._documents: dict[str, bytes] = {}
+        self._runner: web.AppRunner | None = None
+        self._tasks: list[asyncio.Task] = []
+        self.port: int | None = None
+
+    @property
+    def active(self) -> int:
+        """Return the number of requests being served."""
+        return self._active
+
+    @property
+    def name(self) -> str:
+        """Return the product name."""
+        return f"lares 4.0 {self.config.model}"
+
+    def set_zone(self, zone: int, status: str | None = None, bypass: bool | None = None) -> None:
+        """Change the status or bypass of a zone."""
+        if status is not None:
+            self.zones[zone]["status"] = status
+
+        if bypass is not None:
+            self.zones[zone]["bypass"] = "BYPASS" if bypass else "UN_BYPASS"
+
+        self._documents.pop("zonesStatus", None)
+
+    def set_partition(self, partition: int, status: str) -> None:
+        """Change the status of a partition."""
+        self.partitions[partition] = status
+        self._documents.pop("partitionsStatus", None)
+
+    def create_app(self) -> web.Application:
+        """Create the web application."""
+        app = web.Application(middlewares=[self._middleware])
+        model = self.config.model
+
+        routes = {
+            "/xml/info/generalInfo.xml": self._general_info,
+            f"/xml/zones/zonesStatus{model}.xml": self._zones_status,
+            f"/xml/zones/zonesDescription{model}.xml": self._zones_description,
+            f"/xml/partitions/partitionsStatus{model}.xml": self._partitions_status,
+            f"/xml/partitions/partitionsDescription{model}.xml": self._partitions_description,
+            "/xml/scenarios/scenariosOptions.xml": self._scenarios_options,
+            "/xml/scenarios/scenariosDescription.xml": self._scenarios_description,
+            "/xml/cmd/cmdOk.xml": self._command,
+            "/xml/cmd/cmdError.xml": self._command_error,
+        }
+
+        for path, handler in routes.items():
+            app.router.add_get(path, handler)
+
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start serving, returns the port in use."""
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+
+        self.port = self._runner.addresses[0][1]
+        self._tasks = [
+            asyncio.create_task(self._run_transition(event))
+            for event in self.config.transitions
+        ]
+
+        return self.port
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        for task in self._tasks:
+            task.cancel()
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Authenticate, then apply the connection limit, latency and errors."""
+        try:
+            auth = BasicAuth.decode(request.headers.get(hdrs.AUTHORIZATION, ""))
+        except ValueError:
+            auth = None
+
+        if auth != self._auth:
+            raise web.HTTPUnauthorized(headers={hdrs.WWW_AUTHENTICATE: 'Basic realm="lares"'})
+
+        if self.config.max_connections and self._active >= self.config.max_connections:
+            raise web.HTTPServiceUnavailable()
+
+        self._active += 1
+        self.requests[request.path] = self.requests.get(request.path, 0) + 1
+
+        try:
+            delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if self._random.random() < self.config.drop_rate:
+                request.transport.close()
+                raise web.HTTPInternalServerError()
+
+            if self._random.random() < self.config.error_rate:
+                raise web.HTTPInternalServerError()
+
+            return await handler(request)
+        finally:
+            self._active -= 1
+
+    def _respond(self, request: web.Request, key: str, build) -> web.Response:
+        """Respond with a cached document, honoring If-None-Match when enabled."""
+        body = self._documents.get(key)
+
+        if body is None:
+            body = self._documents[key] = build().encode()
+
+        if not self.config.etag:
+            return web.Response(body=body, content_type="text/xml")
+
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            return web.Response(status=304, headers={hdrs.ETAG: etag})
+
+        return web.Response(body=body, content_type="text/xml", headers={hdrs.ETAG: etag})
+
+    async def _general_info(self, request: web.Request) -> web.Response:
+        return self._respond(
+            request,
+            "generalInfo",
+            lambda: (
+                "<generalInfo>"
+                f"<productName>{self.name}</productName>"
+                "<info1>Simulator</info1>"
+                "<productHighRevision>1</productHighRevision>"
+                "<productLowRevision>0</productLowRevision>"
+                "<productBuildRevision>42</productBuildRevision>"
+                "</generalInfo>"
+            ),
+        )
+
+    async def _zones_status(self, request: web.Request) -> web.Response:
+        return self._respond(
+            request,
+            "zonesStatus",
+            lambda: "<zonesStatus>"
+            + "".join(
+                f"<zone><status>{zone['status']}</status><bypass>{zone['bypass']}</bypass></zone>"
+                for zone in self.zones
+            )
+            + "</zonesStatus>",
+        )
+
+    async def _zones_description(self, request: web.Request) -> web.Response:
+        return self._respond(
+            request,
+            "zonesDescription",
+            lambda: _descriptions("zonesDescription", "zone", "Zone", len(self.zones)),
+        )
+
+    async def _partitions_status(self, request: web.Request) -> web.Response:
+        return self._respond(
+            request,
+            "partitionsStatus",
+            lambda: "<partitionsStatus>"
+            + "".join(f"<partition>{status}</partition>" for status in self.partitions)
+            + "</partitionsStatus>",
+        )
+
+    async def _partitions_description(self, request: web.Request) -> web.Response:
+        return self._respond(
+            request,
+            "partitionsDescription",
+            lambda: _descriptions(
+                "partitionsDescription", "partition", "Partition", len(self.partitions)
+            ),
+        )
+
+    async def _scenarios_options(self, request: web.Request) -> web.Response:
+        return self._respond(
+            request,
+            "scenariosOptions",
+            lambda: "<scenariosOptions>"
+            + "<scenario><abil>TRUE</abil><nopin>FALSE</nopin></scenario>" * SCENARIOS
+            + "</scenariosOptions>",
+        )
+
+    async def _scenarios_description(self, request: web.Request) -> web.Response:
+        return self._respond(
+            request,
+            "scenariosDescription",
+            lambda: "<scenariosDescription><scenario>Disarm</scenario>"
+            + _items("scenario", "Scenario", SCENARIOS, start=1)
+            + "</scenariosDescription>",
+        )
+
+    async def _command(self, request: web.Request) -> web.Response:
+        """Handle a command, redirecting to the error page on a wrong PIN."""
+        query = request.query
+
+        if query.get("pin") != self.config.pin:
+            raise web.HTTPFound(query.get("redirectPage", "/xml/cmd/cmdError.xml"))
+
+        command = query.get("cmd")
+
+        if command == "setByPassZone":
+            self.set_zone(int(query["zoneId"]) - 1, bypass=query["zoneValue"] == "1")
+        elif command == "setMacro":
+            self._activate_scenario(int(query["macroId"]))
+        else:
+            raise web.HTTPFound(query.get("redirectPage", "/xml/cmd/cmdError.xml"))
+
+        return web.Response(body=b"<cmd>cmdSent</cmd>", content_type="text/xml")
+
+    async def _command_error(self, request: web.Request) -> web.Response:
+        return web.Response(body=b"<cmd>cmdError</cmd>", content_type="text/xml")
+
+    def _activate_scenario(self, scenario: int) -> None:
+        """Disarm for the first scenario, arm all partitions after an exit delay otherwise."""
+        if scenario == 0:
+            for idx in range(len(self.partitions)):
+                self.set_partition(idx, "DISARMED")
+            return
+
+        for idx in range(len(self.partitions)):
+            self.set_partition(idx, "EXIT")
+            self._tasks.append(
+                asyncio.create_task(
+                    self._run_transition({"at": 0, "partition": idx, "status": "ARMED"}, EXIT_DELAY)
+                )
+            )
+
+    async def _run_transition(self, event: dict, delay: float | None = None) -> None:
+        """Apply a scripted transition at its time."""
+        await asyncio.sleep(event["at"] if delay is None else delay)
+
+        if "zone" in event:
+            self.set_zone(event["zone"], event.get("status"), event.get("bypass"))
+        else:
+            self.set_partition(event["partition"], event["status"])
+
+        _LOGGER.info("Transition %s", event)
+
+
+def _items(tag: str, prefix: str, count: int, start: int = 0) -> str:
+    return "".join(
+        f"<{tag}>{escape(prefix)} {idx + 1}</{tag}>" for idx in range(start, count)
+    )
+
+
+def _descriptions(root: str, tag: str, prefix: str, count: int) -> str:
+    return f"<{root}>{_items(tag, prefix, count)}</{root}>"
+
+
+def main() -> None:
+    """Run the simulator from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4202)
+    parser.add_argument("--model", choices=MODELS, default="48IP")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--pin", default="123456")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra seconds")
+    parser.add_argument("--max-connections", type=int, default=0, help="0 for unlimited")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of HTTP 500s")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="share of dropped connections")
+    parser.add_argument("--etag", action="store_true", help="send ETag and honor If-None-Match")
+    parser.add_argument("--transitions", help="JSON file with scripted transitions")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    transitions = []
+
+    if args.transitions:
+        with open(args.transitions, encoding="utf-8") as file:
+            transitions = json.load(file)
+
+    config = SimulatorConfig(
+        model=args.model,
+        username=args.username,
+        password=args.password,
+        pin=args.pin,
+        latency=args.latency,
+        jitter=args.jitter,
+        max_connections=args.max_connections,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        etag=args.etag,
+        transitions=transitions,
+        seed=args.seed,
+    )
+
+    logging.basicConfig(level=logging.INFO)
+
+    async def run() -> None:
+        simulator = LaresSimulator(config)
+        port = await simulator.start(args.host, args.port)
+        _LOGGER.info("Simulating %s on http://%s:%s", simulator.name, args.host, port)
+
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await simulator.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
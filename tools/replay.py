@@ -0,0 +1,190 @@
+"""Replay recorded Ksenia Lares traffic through the client, coordinator and entities.
+
+Recordings are made with the ksenia_lares.record_traffic service. Every
+recorded poll cycle is replayed with the recorded responses, at the recorded
+pace divided by the speed; a speed of 0 replays as fast as possible, for
+deterministic profiling of parsing, diffing and entity updates.
+
+    python tools/replay.py ksenia_lares_<entry>_<time>.jsonl.gz --speed 0
+    python tools/replay.py recording.jsonl.gz --speed 0 --profile replay.prof
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+import logging
+from pathlib import Path
+import sys
+import tempfile
+import time
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.ksenia_lares.base import LaresBase  # noqa: E402
+from custom_components.ksenia_lares.const import (  # noqa: E402
+    DATA_PARTITIONS,
+    DATA_SCENARIOS,
+    DATA_ZONES,
+)
+from custom_components.ksenia_lares.coordinator import (  # noqa: E402
+    LaresDataUpdateCoordinator,
+)
+from custom_components.ksenia_lares.store import LaresDescriptionStore  # noqa: E402
+from custom_components.ksenia_lares.traffic import (  # noqa: E402
+    LaresReplayTransport,
+    load_recording,
+)
+from benchmark import create_entities  # noqa: E402
+
+# Requests of one poll cycle start within this many seconds
+CYCLE_WINDOW = 0.5
+
+RESOURCES = {
+    "zones/zonesStatus": DATA_ZONES,
+    "partitions/partitionsStatus": DATA_PARTITIONS,
+    "scenarios/scenariosOptions": DATA_SCENARIOS,
+}
+
+GENERAL_INFO_FIELDS = {
+    "name": "productName",
+    "info": "info1",
+    "version": "productHighRevision",
+    "revision": "productLowRevision",
+    "build": "productBuildRevision",
+}
+
+
+def general_info(info: dict) -> dict:
+    """Return a general info response, in case it was not recorded."""
+    fields = "".join(
+        f"<{field}>{escape(str(info.get(key, '')))}</{field}>"
+        for key, field in GENERAL_INFO_FIELDS.items()
+    )
+
+    return {
+        "t": 0,
+        "path": "info/generalInfo.xml",
+        "latency": 0,
+        "status": 200,
+        "body": f"<generalInfo>{fields}</generalInfo>",
+    }
+
+
+def cycles(entries: list[dict]) -> list[tuple[float, set[str]]]:
+    """Group the recorded status requests into poll cycles."""
+    result: list[tuple[float, set[str]]] = []
+
+    for entry in entries:
+        key = next(
+            (key for prefix, key in RESOURCES.items() if entry["path"].startswith(prefix)),
+            None,
+        )
+
+        if key is None:
+            continue
+
+        if result and entry["t"] - result[-1][0] < CYCLE_WINDOW:
+            result[-1][1].add(key)
+        else:
+            result.append((entry["t"], {key}))
+
+    return result
+
+
+async def replay(filename: str, speed: float) -> dict[str, float]:
+    """Replay a recording, returning where the time went."""
+    header, entries = load_recording(filename)
+    info = header["info"]
+
+    if not any(entry["path"] == "info/generalInfo.xml" for entry in entries):
+        entries.insert(0, general_info(info))
+
+    transport = LaresReplayTransport(entries, speed)
+    client = LaresBase(
+        {
+            "host": "replay",
+            "port": 0,
+            "username": "",
+            "password": "",
+            "mac": "00:00:00:00:00:00",
+        },
+        transport=transport,
+    )
+    client.preload_descriptions(info["descriptions"])
+    poll_cycles = cycles(entries)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        store = LaresDescriptionStore(hass, "replay", client)
+        coordinator = LaresDataUpdateCoordinator(hass, client, {}, store)
+        # Cycles are driven by the recording, not by the coordinator timer
+        coordinator.update_interval = None
+
+        # The first cycle fetches every resource, including the descriptions
+        await coordinator.async_refresh()
+        entities = await create_entities(hass, coordinator)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        busy = 0.0
+
+        for at, keys in poll_cycles[1:]:
+            if speed > 0:
+                await asyncio.sleep(max(0, start + at / speed - loop.time()))
+
+            for key in keys:
+                coordinator._last_poll[key] = float("-inf")
+
+            cycle_start = time.perf_counter()
+            await coordinator.async_refresh()
+            busy += time.perf_counter() - cycle_start
+
+        for entity in entities:
+            await entity.async_will_remove_from_hass()
+
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    return {
+        "cycles": len(poll_cycles) - 1,
+        "requests": len(entries),
+        "parsed": client.counters["parsed"],
+        "unchanged": client.counters["unchanged"],
+        "busy_s": busy,
+        "per_cycle_ms": busy / max(len(poll_cycles) - 1, 1) * 1000,
+    }
+
+
+def main() -> None:
+    """Replay a recording from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording")
+    parser.add_argument("--speed", type=float, default=1.0, help="0 for no delays")
+    parser.add_argument("--profile", help="write cProfile statistics to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    # Entities are added without a platform, which Home Assistant warns about
+    logging.getLogger("homeassistant.helpers.entity").setLevel(logging.ERROR)
+
+    profile = cProfile.Profile() if args.profile else None
+
+    if profile is not None:
+        profile.enable()
+
+    results = asyncio.run(replay(args.recording, args.speed))
+
+    if profile is not None:
+        profile.disable()
+        profile.dump_stats(args.profile)
+
+    for name, value in results.items():
+        print(f"{name:15} {value:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Scaling benchmark of many Ksenia Lares panels in one Home Assistant instance.
+
+Polls simulated panels, served from a separate process, with a coordinator
+per panel and reports the event loop lag and the CPU time per panel. Panels
+are either independent, each with its own connection pool, or share the
+pool and request limit of the LaresManager.
+
+    python tools/scaling_benchmark.py --panels 100 --duration 60
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Callable
+import logging
+import multiprocessing
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.ksenia_lares.base import LaresBase  # noqa: E402
+from custom_components.ksenia_lares.coordinator import (  # noqa: E402
+    LaresDataUpdateCoordinator,
+)
+from custom_components.ksenia_lares.manager import LaresManager  # noqa: E402
+from custom_components.ksenia_lares.stats import RollingHistogram  # noqa: E402
+from custom_components.ksenia_lares.store import LaresDescriptionStore  # noqa: E402
+from lares_simulator import MODELS, LaresSimulator, SimulatorConfig  # noqa: E402
+
+LAG_INTERVAL = 0.01
+PEAK_INTERVAL = 0.002
+
+
+def serve(connection, panels: int, config: SimulatorConfig) -> None:
+    """Serve the simulated panels until told to stop.
+
+    A "peak" message is answered with the highest number of requests served
+    at the same time by all panels together, and the most requests received
+    within one whole second of the monotonic clock, since the previous one.
+    """
+
+    async def run() -> None:
+        simulators = [LaresSimulator(config) for _ in range(panels)]
+        connection.send([await simulator.start() for simulator in simulators])
+        peak = 0
+        per_second: Counter[int] = Counter()
+
+        def received() -> int:
+            return sum(sum(simulator.requests.values()) for simulator in simulators)
+
+        async def sample() -> None:
+            nonlocal peak
+            total = received()
+
+            while True:
+                peak = max(peak, sum(simulator.active for simulator in simulators))
+                previous, total = total, received()
+                per_second[int(time.monotonic())] += total - previous
+                await asyncio.sleep(PEAK_INTERVAL)
+
+        sampler = asyncio.create_task(sample())
+        loop = asyncio.get_running_loop()
+
+        while await loop.run_in_executor(None, _receive, connection) == "peak":
+            connection.send((peak, max(per_second.values(), default=0)))
+            peak = 0
+            per_second.clear()
+
+        sampler.cancel()
+
+        for simulator in simulators:
+            await simulator.stop()
+
+    asyncio.run(run())
+
+
+def _receive(connection) -> str | None:
+    try:
+        return connection.recv()
+    except EOFError:
+        return None
+
+
+async def monitor_lag(samples: list[float]) -> None:
+    """Measure how late the event loop wakes up a sleeping task."""
+    loop = asyncio.get_running_loop()
+
+    while True:
+        start = loop.time()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(loop.time() - start - LAG_INTERVAL)
+
+
+async def run(
+    ports: list[int], shared: bool, duration: float, start_peaks: Callable[[], None]
+) -> dict[str, float]:
+    """Poll every panel for the given duration, after their first refresh."""
+    coordinators = []
+    manager = LaresManager()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+
+        for idx, port in enumerate(ports):
+            data = {
+                "host": "127.0.0.1",
+                "port": port,
+                "username": "admin",
+                "password": "admin",
+                "mac": f"00:00:00:00:00:{idx:02x}",
+            }
+            entry_id = f"panel_{idx}"
+
+            if shared:
+                client = manager.create_client(entry_id, data)
+                slot = manager.slot(entry_id)
+            else:
+                client = LaresBase(data)
+                slot = idx
+
+            store = LaresDescriptionStore(hass, entry_id, client)
+            coordinator = LaresDataUpdateCoordinator(hass, client, {}, store, slot)
+            coordinators.append(coordinator)
+
+        await asyncio.gather(
+            *(coordinator.async_refresh() for coordinator in coordinators)
+        )
+
+        # Leave the wait behind the description documents of the start out
+        for coordinator in coordinators:
+            coordinator.client.stats.queue_wait = RollingHistogram()
+
+        start_peaks()
+        lag: list[float] = []
+        monitor = asyncio.create_task(monitor_lag(lag))
+        cpu = time.process_time()
+        start = time.perf_counter()
+
+        # A listener is what makes a coordinator schedule its refreshes
+        unsubscribers = [
+            coordinator.async_add_listener(lambda: None)
+            for coordinator in coordinators
+        ]
+
+        await asyncio.sleep(duration)
+
+        cpu = time.process_time() - cpu
+        elapsed = time.perf_counter() - start
+        monitor.cancel()
+
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+
+        for idx, coordinator in enumerate(coordinators):
+            await coordinator.async_shutdown()
+
+            if shared:
+                await manager.async_release(f"panel_{idx}")
+            else:
+                await coordinator.client.close()
+
+        requests = sum(
+            stats.requests
+            for coordinator in coordinators
+            for stats in coordinator.client.stats.endpoints.values()
+        )
+        failures = sum(
+            stats.errors + stats.timeouts
+            for coordinator in coordinators
+            for stats in coordinator.client.stats.endpoints.values()
+        )
+
+        # Each client keeps the wait of its latest requests
+        queue_wait = statistics.mean(
+            coordinator.client.stats.queue_wait.percentile(95) or 0
+            for coordinator in coordinators
+        )
+
+        await hass.async_stop(force=True)
+
+    lag.sort()
+
+    return {
+        "lag_p50_ms": statistics.median(lag) * 1000,
+        "lag_p95_ms": lag[int(len(lag) * 0.95)] * 1000,
+        "lag_max_ms": lag[-1] * 1000,
+        "cpu_ms_per_panel_per_s": cpu / len(ports) / elapsed * 1000,
+        "requests_per_s": requests / elapsed,
+        "failed_requests": failures,
+        "queue_wait_p95_ms": queue_wait * 1000,
+    }
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--panels", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30, help="seconds per mode")
+    parser.add_argument("--model", choices=MODELS, default="48IP")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument(
+        "--mode", choices=["independent", "shared", "both"], default="both"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    config = SimulatorConfig(model=args.model, latency=args.latency, jitter=args.jitter)
+    connection, child_connection = multiprocessing.Pipe()
+    server = multiprocessing.Process(
+        target=serve, args=(child_connection, args.panels, config), daemon=True
+    )
+    server.start()
+    ports = connection.recv()
+
+    modes = ["independent", "shared"] if args.mode == "both" else [args.mode]
+
+    def start_peaks() -> None:
+        """Restart the peaks measured by the server."""
+        connection.send("peak")
+        connection.recv()
+
+    try:
+        for mode in modes:
+            results = asyncio.run(
+                run(ports, mode == "shared", args.duration, start_peaks)
+            )
+
+            connection.send("peak")
+            (
+                results["peak_concurrent_requests"],
+                results["peak_requests_in_one_second"],
+            ) = connection.recv()
+            print(f"{args.panels} panels, {mode}:")
+
+            for name, value in results.items():
+                print(f"  {name:26} {value:10.2f}")
+    finally:
+        connection.send(None)
+        server.join(timeout=10)
+
+
+if __name__ == "__main__":
+    main()